@@ -1,10 +1,12 @@
 from manim import *
-from manim_slides import Slide
+from deck import Deck, register_section_scenes
+from flowchart import FlowChart
+from charts import line_chart, load_series
+from mobject_cache import cached_code, cached_image, cached_paragraph, cached_svg, cached_text
+from profile_deck import profiled
 from manim.utils import color
 from manim.utils.color import interpolate_color
 from numpy.random import RandomState
-import numpy as np
-import pandas as pd
 
 rng = RandomState(0)
 MAIN_COLOR = color.TEAL_A
@@ -32,186 +34,116 @@ def replace_nth_line(string, n, repl):
         lines[n-1] = repl
     return "\n".join(lines)
 
+@profiled
 def keep_only_objects(slide, grp):
     slide.clear()
     for _ in grp:
         slide.add(_)
 
-class Apptainer(Slide):
-
-    def itemize(self, items, anchor, distance, stepwise, **kwargs):
-        anims = []
-        mobjs = []
-        for i in range(len(items)):
-            mobjs.append(Text(f"{i+1}{ITEM_ICON} {items[i]}", font_size=small_size, **kwargs))
-            if i == 0:
-                mobjs[i].next_to(anchor, DOWN*distance).align_to(anchor, LEFT)
-            else:
-                mobjs[i].next_to(mobjs[i-1], DOWN).align_to(mobjs[i-1], LEFT)
-        anims = [FadeIn(mobjs[i]) for i in range(len(items))]
+class Apptainer(Deck):
+
+    SECTIONS = (
+        "intro", "t00", "t01", "t02", "t03", "t10", "t11", "t12",
+        "t20", "t21", "t22", "t23", "t24", "t25", "t30", "t31", "t40",
+    )
+    # t32 joins SECTIONS once data/scaling.csv holds measured runs
+
+    @profiled
+    def itemize(self, items, anchor, distance, stepwise=False, color=MAIN_COLOR):
+        # The whole list is one paragraph (a single Pango layout), numbers in bold and color
+        bullets = [f"{i+1}{ITEM_ICON}" for i in range(len(items))]
+        par = cached_paragraph(*[f"{b} {item}" for b, item in zip(bullets, items)],
+            alignment="left", font_size=small_size,
+            t2w={b: BOLD for b in bullets}, t2c={b: color for b in bullets})
+        par.next_to(anchor, DOWN*distance).align_to(anchor, LEFT)
+        lines = par.chars
         if stepwise:
-            for a in anims:
-                self.play(a)
+            # Pause before each item after the first
+            for i, line in enumerate(lines):
+                if i > 0:
+                    self.next_slide()
+                self.play(FadeIn(line))
         else:
-            self.play(AnimationGroup(*anims))
-        return mobjs[-1]
+            self.play(LaggedStart(*[FadeIn(line) for line in lines], lag_ratio=0.15))
+        return lines[-1]
 
-    def construct(self):
+    def setup(self):
         self.camera.background_color = BACKGROUND_COLOR
+
+    def intro(self):
         # Title page
-        layout = Group()
-        title = Text(f"Apptainer containers for OpenFOAM", font_size=big_size)#.to_edge(UP+LEFT)
-        footer = Text("Research Software Engineering SIG Meeting", t2w={"NHR4CES": BOLD}, font_size=very_small_size).to_edge(DOWN+RIGHT)
-        author = Text("Mohammed Elwardi Fadeli, Oct. 2024", font_size=very_small_size).to_edge(DOWN+LEFT)
-        logo = ImageMobject("./images/nhr-tu-logo.png").next_to(title, UP).scale(0.6)#.to_edge(UP+RIGHT)
-        layout.add(title, footer, author, logo)
-        self.play(FadeIn(layout))
-        self.next_slide()
-
-        c1 = Text(f"Write Code")
-        b1 = SurroundingRectangle(c1, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg1 = BackgroundRectangle(c1, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg1 = VGroup(c1, b1, bg1).to_edge(LEFT+UP).shift(0.5*RIGHT)
+        self.layout = Group()
+        self.title = cached_text(f"Apptainer containers for OpenFOAM", font_size=big_size)#.to_edge(UP+LEFT)
+        footer = cached_text("Research Software Engineering SIG Meeting", t2w={"NHR4CES": BOLD}, font_size=very_small_size).to_edge(DOWN+RIGHT)
+        author = cached_text("Mohammed Elwardi Fadeli, Oct. 2024", font_size=very_small_size).to_edge(DOWN+LEFT)
+        logo = cached_image("./images/nhr-tu-logo.png", max_scale=0.6).next_to(self.title, UP).scale(0.6)#.to_edge(UP+RIGHT)
+        self.layout.add(self.title, footer, author, logo)
+        self.play(FadeIn(self.layout))
+        self.next_slide()
+
+        chart = FlowChart({
+            "code": dict(label="Write Code", color=MAIN_COLOR, to_edge=LEFT+UP, shift=0.5*RIGHT),
+            "build": dict(label="Build", color=MAIN_COLOR, next_to=("code", 5*RIGHT)),
+            "test": dict(label="Test", color=MAIN_COLOR, next_to=("build", 3*DOWN)),
+            "push": dict(label="Push to Version Control", color=MAIN_COLOR, next_to=("test", 4*RIGHT)),
+            "ci": dict(label="Trigger CI", color=DOT_COLOR, next_to=("push", 4*RIGHT)),
+            "ci_build": dict(label="Build", color=DOT_COLOR, next_to=("ci", 4*DOWN)),
+            "ci_test": dict(label="Test", color=DOT_COLOR, next_to=("ci_build", 4*DOWN)),
+            "deploy": dict(label="Deploy/Release", color=DOT_COLOR, next_to=("ci_test", 4*LEFT)),
+            "fetch": dict(label="Fetch Code", color=GREEN, next_to=("test", 6.1*DOWN), shift=1.1*RIGHT),
+            "run": dict(label="Run", color=GREEN, next_to=("fetch", 2*(LEFT+DOWN))),
+            "analyze": dict(label="Analyze results", color=GREEN, next_to=("code", 10*DOWN)),
+        }, [
+            ("code", "build", RIGHT, LEFT),
+            ("build", "test", DOWN, UP),
+            ("test", "push", RIGHT, LEFT),
+            ("push", "ci", RIGHT, LEFT),
+            ("ci", "ci_build", DOWN, UP),
+            ("ci_build", "ci_test", DOWN, UP),
+            ("ci_test", "deploy", LEFT, RIGHT),
+            ("push", "fetch", DOWN, RIGHT, dict(angle=-TAU/4, shift=LEFT)),
+            ("fetch", "run", DOWN, RIGHT, dict(angle=-TAU/4)),
+            ("run", "analyze", LEFT, DOWN, dict(angle=-TAU/6)),
+            ("analyze", "code", UP, DOWN),
+        ], buff=BOX_BUFF)
         anims =[
-            Transform(title, vg1),
+            Transform(self.title, chart.node("code")),
             Transform(logo, logo.copy().scale(0.5).to_edge(UP+RIGHT)),
         ]
         self.play(AnimationGroup(*anims))
         self.next_slide()
 
-        c2 = Text(f"Build")
-        b2 = SurroundingRectangle(c2, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg2 = BackgroundRectangle(c2, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg2 = VGroup(c2, b2, bg2).next_to(vg1, 5*RIGHT)
-        anims =[
-            Create(Arrow(vg1.get_right(), vg2.get_left(), color=MAIN_COLOR, buff=0.1)),
-            FadeIn(vg2)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c3 = Text(f"Test")
-        b3 = SurroundingRectangle(c3, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg3 = BackgroundRectangle(c3, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg3 = VGroup(c3, b3, bg3).next_to(vg2, 3*DOWN)
-        anims =[
-            Create(Arrow(vg2.get_bottom(), vg3.get_top(), color=MAIN_COLOR, buff=0.1)),
-            FadeIn(vg3)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c4 = Text(f"Push to Version Control")
-        b4 = SurroundingRectangle(c4, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg4 = BackgroundRectangle(c4, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg4 = VGroup(c4, b4, bg4).next_to(vg3, 4*RIGHT)
-        anims =[
-            Create(Arrow(vg3.get_right(), vg4.get_left(), color=MAIN_COLOR, buff=0.1)),
-            FadeIn(vg4)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c5 = Text(f"Trigger CI")
-        b5 = SurroundingRectangle(c5, color=DOT_COLOR, buff=BOX_BUFF)
-        bg5 = BackgroundRectangle(c5, color=DOT_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg5 = VGroup(c5, b5, bg5).next_to(vg4, 4*RIGHT)
-        anims =[
-            Create(Arrow(vg4.get_right(), vg5.get_left(), color=DOT_COLOR, buff=0.1)),
-            FadeIn(vg5)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        vg6 = vg2.copy().set(color=DOT_COLOR).next_to(vg5, 4*DOWN)
-        vg6[0].set(color=WHITE)
-        anims =[
-            Create(Arrow(vg5.get_bottom(), vg6.get_top(), color=DOT_COLOR, buff=0.1)),
-            FadeIn(vg6)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        vg7 = vg3.copy().set(color=DOT_COLOR).next_to(vg6, 4*DOWN)
-        vg7[0].set(color=WHITE)
-        anims =[
-            Create(Arrow(vg6.get_bottom(), vg7.get_top(), color=DOT_COLOR, buff=0.1)),
-            FadeIn(vg7)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c8 = Text(f"Deploy/Release")
-        b8 = SurroundingRectangle(c8, color=DOT_COLOR, buff=BOX_BUFF)
-        bg8 = BackgroundRectangle(c8, color=DOT_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg8 = VGroup(c8, b8, bg8).next_to(vg7, 4*LEFT)
-        anims =[
-            Create(Arrow(vg7.get_left(), vg8.get_right(), color=DOT_COLOR, buff=0.1)),
-            FadeIn(vg8)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c9 = Text(f"Fetch Code")
-        b9 = SurroundingRectangle(c9, color=GREEN, buff=BOX_BUFF)
-        bg9 = BackgroundRectangle(c9, color=GREEN, fill_opacity=0.3, buff=BOX_BUFF)
-        vg9 = VGroup(c9, b9, bg9).next_to(vg3, 6.1*DOWN).shift(1.1*RIGHT)
-        anims =[
-            Create(CurvedArrow(vg4.get_bottom()+LEFT, vg9.get_right(), color=GREEN, angle=-TAU/4)),
-            FadeIn(vg9)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
-
-        c10 = Text(f"Run")
-        b10 = SurroundingRectangle(c10, color=GREEN, buff=BOX_BUFF)
-        bg10 = BackgroundRectangle(c10, color=GREEN, fill_opacity=0.3, buff=BOX_BUFF)
-        vg10 = VGroup(c10, b10, bg10).next_to(vg9, 2*(LEFT+DOWN))
-        anims =[
-            Create(CurvedArrow(vg9.get_bottom(), vg10.get_right(), color=GREEN, angle=-TAU/4)),
-            FadeIn(vg10)
-        ]
-        self.play(AnimationGroup(*anims))
-        self.next_slide()
+        # Each node comes in with the arrow leading to it, the loop closes last
+        for src, dst in list(chart.edges)[:-1]:
+            self.play(chart.reveal((src, dst), dst))
+            self.next_slide()
 
-        c11 = Text(f"Analyze results")
-        b11 = SurroundingRectangle(c11, color=GREEN, buff=BOX_BUFF)
-        bg11 = BackgroundRectangle(c11, color=GREEN, fill_opacity=0.3, buff=BOX_BUFF)
-        vg11 = VGroup(c11, b11, bg11).next_to(vg1, 10*DOWN)
-        anims =[
-            Create(CurvedArrow(vg10.get_left(), vg11.get_bottom(), color=GREEN, angle=-TAU/6)),
-            FadeIn(vg11)
-        ]
-        self.play(AnimationGroup(*anims))
+        self.play(chart.reveal(("analyze", "code")))
         self.next_slide()
 
-        self.play(
-            Create(Arrow(vg11.get_top(), vg1.get_bottom(), color=MAIN_COLOR, buff=0.1)),
-        )
-        self.next_slide()
-
-        bg12 = BackgroundRectangle(Group(vg2,vg3), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
-        ttx = Text(f"containerize local dev.", color=YELLOW).next_to(bg12, 0.5*DOWN)
+        bg12 = BackgroundRectangle(Group(chart.node("build"), chart.node("test")), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
+        ttx = cached_text(f"containerize local dev.", color=YELLOW).next_to(bg12, 0.5*DOWN)
         self.play(FadeIn(bg12), Create(ttx))
         self.next_slide()
 
-        bg13 = BackgroundRectangle(Group(vg6,vg7,vg8), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
-        ttx = Text(f"containerize CI/CD", color=YELLOW).next_to(bg13, 0.5*UP).shift(LEFT)
+        bg13 = BackgroundRectangle(Group(chart.node("ci_build"), chart.node("ci_test"), chart.node("deploy")), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
+        ttx = cached_text(f"containerize CI/CD", color=YELLOW).next_to(bg13, 0.5*UP).shift(LEFT)
         self.play(FadeIn(bg13), Create(ttx))
         self.next_slide()
 
-        bg14 = BackgroundRectangle(Group(vg9,vg10,vg11), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
-        ttx = Text(f"containerize on HPC", color=YELLOW).next_to(bg14, 0.5*DOWN).shift(1.5*RIGHT)
+        bg14 = BackgroundRectangle(Group(chart.node("fetch"), chart.node("run"), chart.node("analyze")), color=YELLOW, fill_opacity=0.15, buff=BOX_BUFF/2)
+        ttx = cached_text(f"containerize on HPC", color=YELLOW).next_to(bg14, 0.5*DOWN).shift(1.5*RIGHT)
         arr = Arrow(bg13.get_left(), bg14.get_right(), color=YELLOW, buff=0.1)
         self.play(FadeIn(bg14), Create(ttx), Create(arr))
         self.next_slide()
 
-        t00 = Text(f"0.0 Benefits of isolation...", t2w={"0.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t00))
+    def t00(self):
+        t00 = cached_text(f"0.0 Benefits of isolation...", t2w={"0.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t00))
         self.next_slide()
 
-        objs = Text("- Containers:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Containers:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "Controled versionning of dependencies.",
@@ -219,29 +151,26 @@ class Apptainer(Slide):
             "Lightweight, uses host's Kernel.",
             "Partial isolation from host machine."
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        objs = Text("- Virtual Machines?", font_size=mid_size).next_to(title, DOWN*14).align_to(title, LEFT)
+        objs = cached_text("- Virtual Machines?", font_size=mid_size).next_to(self.title, DOWN*14).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "Better control over dedicated resources.",
             "Full isolation from host machine.",
             "Higher provisionning overhead.",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        t01 = Text(f"0.1 Use case insights", t2w={"0.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t01))
+    def t01(self):
+        t01 = cached_text(f"0.1 Use case insights", t2w={"0.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t01))
         self.next_slide()
 
-        objs = Text("- Image creation and administration:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Image creation and administration:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "Get images from HUBs or build from definition files.",
@@ -249,12 +178,10 @@ class Apptainer(Slide):
             "Can CI/CD build container images? When?",
             "Should images be suitable for local development?"
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        objs = Text("- Container runs:", font_size=mid_size).next_to(title, DOWN*14).align_to(title, LEFT)
+        objs = cached_text("- Container runs:", font_size=mid_size).next_to(self.title, DOWN*14).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "HPC: MPI/Slurm compatibility is a must.",
@@ -262,95 +189,67 @@ class Apptainer(Slide):
             "User convenience even with minial training.",
             "Security: Oh no! -> next slide"
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
-        self.next_slide()
-
-        t02 = Text(f"0.2 Cluster admins and container tech", t2w={"0.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t02))
-        self.next_slide()
-
-        c1 = Text(f"Docker Daemon")
-        b1 = SurroundingRectangle(c1, color=DOT_COLOR, buff=BOX_BUFF)
-        bg1 = BackgroundRectangle(c1, color=DOT_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg1 = VGroup(c1, b1, bg1).shift(2*LEFT)
+        last = self.itemize(items, objs, 1.5)
+        self.next_slide()
+
+    def t02(self):
+        t02 = cached_text(f"0.2 Cluster admins and container tech", t2w={"0.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t02))
+        self.next_slide()
+
+        chart = FlowChart({
+            "docker": dict(label="Docker Daemon", color=DOT_COLOR, shift=2*LEFT),
+            "image": dict(label="Image building", color=MAIN_COLOR, next_to=("docker", 3*LEFT)),
+            "exec": dict(label="Container exec", color=MAIN_COLOR, next_to=("docker", 3*(DOWN+LEFT))),
+            "kernel": dict(label="Kernel", color=YELLOW, next_to=("docker", 3*DOWN)),
+            "user": dict(label="user:docker", color=YELLOW, next_to=("docker", 3*(UP+LEFT))),
+        }, [
+            ("docker", "image", LEFT, RIGHT),
+            ("docker", "exec", DL, UR),
+            ("docker", "kernel", DOWN, UP),
+            ("user", "docker", RIGHT, UP, dict(angle=-TAU/4, color=YELLOW)),
+        ], buff=BOX_BUFF)
         sep = Line(UP*2.5, DOWN*2.5, stroke_width=3, color=GRAPH_COLOR)
-        tx1 = Text(f"Daemon runs as a service, owned by root", font_size=mid_size).next_to(sep, RIGHT).shift(2*UP)
-        self.play(FadeIn(vg1, sep, tx1))
+        tx1 = cached_text(f"Daemon runs as a service, owned by root", font_size=mid_size).next_to(sep, RIGHT).shift(2*UP)
+        self.play(FadeIn(chart.node("docker"), sep, tx1))
         self.next_slide()
 
-
-        c2 = Text(f"Image building")
-        b2 = SurroundingRectangle(c2, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg2 = BackgroundRectangle(c2, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg2 = VGroup(c2, b2, bg2).next_to(vg1, 3*LEFT)
-        anims =[
-            Create(Arrow(vg1.get_left(), vg2.get_right(), color=MAIN_COLOR, buff=0.1)),
-            FadeIn(vg2)
-        ]
-        tx2 = Text(f"", font_size=mid_size).next_to(sep, 0.5*RIGHT).shift(2*UP)
-        self.play(AnimationGroup(*anims))
+        self.play(chart.reveal(("docker", "image"), "image"))
         self.next_slide()
 
-        c3 = Text(f"Container exec")
-        b3 = SurroundingRectangle(c3, color=MAIN_COLOR, buff=BOX_BUFF)
-        bg3 = BackgroundRectangle(c3, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
-        vg3 = VGroup(c3, b3, bg3).next_to(vg1, 3*(DOWN+LEFT))
-        anims =[
-            Create(Arrow(
-                np.array([vg1.get_left()[0],vg1.get_bottom()[1], 0]),
-                np.array([vg3.get_right()[0], vg3.get_top()[1], 0]),
-                color=MAIN_COLOR, buff=0.1)),
-            FadeIn(vg3)
-        ]
-        self.play(AnimationGroup(*anims))
+        self.play(chart.reveal(("docker", "exec"), "exec"))
         self.next_slide()
 
-
-        c4 = Text(f"Kernel")
-        b4 = SurroundingRectangle(c4, color=YELLOW, buff=BOX_BUFF)
-        bg4 = BackgroundRectangle(c4, color=YELLOW, fill_opacity=0.3, buff=BOX_BUFF)
-        vg4 = VGroup(c4, b4, bg4).next_to(vg1, 3*DOWN)
-        anims =[
-            Create(Arrow(vg1.get_bottom(), vg4.get_top(), color=YELLOW, buff=0.1)),
-            FadeIn(vg4)
-        ]
-        self.play(AnimationGroup(*anims))
+        self.play(chart.reveal(("docker", "kernel"), "kernel"))
         self.next_slide()
 
-        c5 = Text(f"user:docker")
-        b5 = SurroundingRectangle(c5, color=YELLOW, buff=BOX_BUFF)
-        bg5 = BackgroundRectangle(c5, color=YELLOW, fill_opacity=0.3, buff=BOX_BUFF)
-        vg5 = VGroup(c5, b5, bg5).next_to(vg1, 3*(UP+LEFT))
-        tx2 = Text(f"docker grp can easily escalate privileges", font_size=mid_size).next_to(sep, RIGHT).shift(UP)
-        anims =[
-            Create(CurvedArrow(vg5.get_right(), vg1.get_top(), color=YELLOW, angle=-TAU/4)),
-            FadeIn(vg5, tx2)
-        ]
-        self.play(AnimationGroup(*anims))
+        tx2 = cached_text(f"docker grp can easily escalate privileges", font_size=mid_size).next_to(sep, RIGHT).shift(UP)
+        self.play(chart.reveal(("user", "docker"), "user"), FadeIn(tx2))
         self.next_slide()
 
-        tx3 = Text(f"Hard to mount volumes with correct perms", font_size=mid_size).next_to(sep, RIGHT)
-        tx4 = Text(f"Manage resource contention???", font_size=mid_size).next_to(sep, RIGHT).shift(DOWN)
-        tx5 = Text(f"Orchestration within HPC is not trivial", font_size=mid_size).next_to(sep, RIGHT).shift(2*DOWN)
+        tx3 = cached_text(f"Hard to mount volumes with correct perms", font_size=mid_size).next_to(sep, RIGHT)
+        tx4 = cached_text(f"Manage resource contention???", font_size=mid_size).next_to(sep, RIGHT).shift(DOWN)
+        tx5 = cached_text(f"Orchestration within HPC is not trivial", font_size=mid_size).next_to(sep, RIGHT).shift(2*DOWN)
         self.play(FadeIn(tx3, tx4, tx5))
         self.next_slide()
 
-        t03 = Text(f"0.3 Any more container tech?", t2w={"0.3": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
+    def t03(self):
+        t03 = cached_text(f"0.3 Any more container tech?", t2w={"0.3": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        @profiled
         def container_infrastructure(logo, msg, direction=DOWN):
-            imlg = SVGMobject(logo, height=1.5)
-            txt = Text(msg, font_size=small_size).next_to(imlg, direction, buff=0.2)
+            imlg = cached_svg(logo, height=1.5)
+            txt = cached_text(msg, font_size=small_size).next_to(imlg, direction, buff=0.2)
             return VGroup(imlg, txt)
         docker = container_infrastructure("./images/Docker.svg", f"Most popular.")
         podman = container_infrastructure("./images/Podman.svg", f"avoids Docker's daemon.").next_to(docker, 0.5*UR)
         sarus = container_infrastructure("./images/Sarus.svg", f"HPC focused, not popular.").next_to(docker, 0.1*DOWN+0.7*RIGHT)
         singularity = container_infrastructure("./images/Singularity.svg", f"single process execution.").shift(4*LEFT+DOWN)
         apptainer = container_infrastructure("./images/Apptainer.svg", f"Modernized Singularity fork.").next_to(singularity, UP)
+        self.apptainer = apptainer
         self.play(
-            Transform(title, t03),
+            Transform(self.title, t03),
             FadeIn(docker),
             FadeIn(podman),
             FadeIn(sarus),
@@ -359,13 +258,14 @@ class Apptainer(Slide):
         )
         self.next_slide()
 
-        t11 = Text(f"1.0 Is Apptainer any better?", t2w={"1.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        self.play(Transform(apptainer, title))
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t11))
+    def t10(self):
+        t10 = cached_text(f"1.0 Is Apptainer any better?", t2w={"1.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        self.play(Transform(self.apptainer, self.title))
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t10))
         self.next_slide()
 
-        objs = Text("- Some things are better:", font_size=mid_size).next_to(title, DOWN*3).align_to(title, LEFT)
+        objs = cached_text("- Some things are better:", font_size=mid_size).next_to(self.title, DOWN*3).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "No daemon.",
@@ -373,38 +273,33 @@ class Apptainer(Slide):
             "Rootless mode with user namespaces.",
             "Single process execution.",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        objs = Text("- Single process execution?", font_size=mid_size).next_to(last, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Single process execution?", font_size=mid_size).next_to(last, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "Apptainer process launches.",
             "User namespaces get checked.",
             "Replace apptainer process code with user app.",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        objs = Text("- But still using setuid bins:", font_size=mid_size).next_to(title, DOWN*3).align_to(title, LEFT).shift(8*RIGHT)
+        objs = cached_text("- But still using setuid bins:", font_size=mid_size).next_to(self.title, DOWN*3).align_to(self.title, LEFT).shift(8*RIGHT)
         self.play(Create(objs))
         items = [
             "Image mounting.",
             "Namespace creation in the kernel.",
             "Path Binding to container.",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        t12 = Text(f"1.1 Apptainer containers for OpenFOAM", t2w={"1.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t12))
+    def t11(self):
+        t11 = cached_text(f"1.1 Apptainer containers for OpenFOAM", t2w={"1.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t11))
         self.next_slide()
 
         code_t = """git clone https://github.com/FoamScience/openfoam-apptainer-packaging
@@ -415,12 +310,12 @@ ansible-playbook build.yaml \\
     --extra-vars "@config.yaml" 
    
 """
-        code = Code(code=code_t, language="shell", insert_line_no=False)
-        tx1 = Text(f"Convenient building of apptainer images:", font_size=mid_size).next_to(code, UP)
+        code = cached_code(code_t, language="shell", insert_line_no=False)
+        tx1 = cached_text(f"Convenient building of apptainer images:", font_size=mid_size).next_to(code, UP)
         self.play(FadeIn(code), FadeIn(tx1))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+        keep_only_objects(self, self.layout)
 
         code_yaml1 = """containers:
   basic:
@@ -442,18 +337,19 @@ ansible-playbook build.yaml \\
     build_args:
       branch:
         - master"""
-        code1 = Code(code=code_yaml1, language="yaml").to_edge(LEFT)
-        code2 = Code(code=code_yaml2, language="yaml", background="rectangle", line_no_from=13).to_edge(RIGHT).align_to(code1, UP)
-        tx1 = Text(f"A config file is all you need:", font_size=mid_size).next_to(code1, UP)
+        code1 = cached_code(code_yaml1, language="yaml").to_edge(LEFT)
+        code2 = cached_code(code_yaml2, language="yaml", background="rectangle", line_no_from=13).to_edge(RIGHT).align_to(code1, UP)
+        tx1 = cached_text(f"A config file is all you need:", font_size=mid_size).next_to(code1, UP)
         self.play(FadeIn(code1), FadeIn(code2), FadeIn(tx1))
         self.next_slide()
 
-        t13 = Text(f"1.2 Quick feature run-down", t2w={"1.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t13))
+    def t12(self):
+        t12 = cached_text(f"1.2 Quick feature run-down", t2w={"1.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t12))
         self.next_slide()
 
-        objs = Text("- Base containers:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Base containers:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "MPI setup is a 1st class citizen.",
@@ -461,26 +357,23 @@ ansible-playbook build.yaml \\
             "Custom base containers!! Eg. Switch to spack-based images.",
             "Control over container metadata, at build-time."
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        objs = Text("- Project containers:", font_size=mid_size).next_to(last, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Project containers:", font_size=mid_size).next_to(last, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(objs))
         items = [
             "Provide your definition files for your own projects.",
             "Supporting arbitrary build arguments.",
             "Continuous Development -> Persistent Overlays.",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
+        last = self.itemize(items, objs, 1.5)
         self.next_slide()
 
-        t20 = Text(f"2.0 Container usage - Querry the metadata", t2w={"2.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t20))
+    def t20(self):
+        t20 = cached_text(f"2.0 Container usage - Querry the metadata", t2w={"2.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t20))
         self.next_slide()
 
         code_t = """apptainer run containers/projects/test-master.sif info """
@@ -496,29 +389,31 @@ ansible-playbook build.yaml \\
     "branch": "master"
   }
 }"""
-        code = Code(code=code_t, language="shell").shift(2*UP)
-        res = Code(code=res_t, language="json", background="rectangle").next_to(code, DOWN)
+        code = cached_code(code_t, language="shell").shift(2*UP)
+        res = cached_code(res_t, language="json", background="rectangle").next_to(code, DOWN)
         self.play(FadeIn(res, code))
         self.next_slide()
 
-        t21 = Text(f"2.1 Container usage - Run with SLURM", t2w={"2.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t21))
+    def t21(self):
+        t21 = cached_text(f"2.1 Container usage - Run with SLURM", t2w={"2.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t21))
         self.next_slide()
 
         code_t1 = """mpirun apptainer run --sharens containers/projects/test-master.sif \\
     '/opt/OMPIFoam/testOMPIFoam -parallel' """
-        code1 = Code(code=code_t1, language="shell").shift(UP)
-        txt1 = Text(f"These should 'just work' all the same:").next_to(code1,UP)
+        code1 = cached_code(code_t1, language="shell").shift(UP)
+        txt1 = cached_text(f"These should 'just work' all the same:").next_to(code1,UP)
         code_t2 = """apptainer run -C containers/projects/test-master.sif \\
     'mpirun /opt/OMPIFoam/testOMPIFoam -parallel' """
-        code2 = Code(code=code_t2, language="shell").next_to(code1, 1.5*DOWN)
+        code2 = cached_code(code_t2, language="shell").next_to(code1, 1.5*DOWN)
         self.play(FadeIn(code2, code1, txt1))
         self.next_slide()
 
-        t22 = Text(f"2.2 Container usage - Typical case runs", t2w={"2.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t22))
+    def t22(self):
+        t22 = cached_text(f"2.2 Container usage - Typical case runs", t2w={"2.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t22))
         self.next_slide()
 
         code_t1 = """cd /path/to/openfoam/case/on/host/machine
@@ -527,24 +422,26 @@ apptainer run -C container.sif "./Allrun.prepare"
 mpirun -n 16 apptainer run --sharens container.sif \\
     "containerSolver -parallel"
 """
-        code1 = Code(code=code_t1, language="shell")
+        code1 = cached_code(code_t1, language="shell")
         self.play(FadeIn(code1))
         self.next_slide()
 
-        t23 = Text(f"2.3 Container usage - Continuous development", t2w={"2.3": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t23))
+    def t23(self):
+        t23 = cached_text(f"2.3 Container usage - Continuous development", t2w={"2.3": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t23))
 
         code_t = """apptainer overlay create --size 1024 overlay.img
 apptainer run --overlay overlay.img container.sif"""
-        code = Code(code=code_t, language="shell")
-        txt = Text(f"Containers are immutable by default; for CD:").next_to(code, UP)
+        code = cached_code(code_t, language="shell")
+        txt = cached_text(f"Containers are immutable by default; for CD:").next_to(code, UP)
         self.play(FadeIn(txt, code))
         self.next_slide()
 
-        t24 = Text(f"2.4 Container usage - Load custom base containers", t2w={"2.4": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t24))
+    def t24(self):
+        t24 = cached_text(f"2.4 Container usage - Load custom base containers", t2w={"2.4": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t24))
 
         code_t = """containers:
   extra_basics: https://github.com/FoamScience/spack-apptainer-containers
@@ -559,13 +456,14 @@ apptainer run --overlay overlay.img container.sif"""
       framework:
         definition: spack_openfoam
         version: 2312"""
-        code = Code(code=code_t, language="yaml")
+        code = cached_code(code_t, language="yaml")
         self.play(FadeIn(code))
         self.next_slide()
 
-        t25 = Text(f"2.5 Container usage - Debugging and CVEs", t2w={"2.5": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t25))
+    def t25(self):
+        t25 = cached_text(f"2.5 Container usage - Debugging and CVEs", t2w={"2.5": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t25))
         code_t = """# Convert SIF to sandbox dir.
 apptainer build --sandbox my-container container.sif
 # Compare to base docker image
@@ -574,18 +472,21 @@ docker scout compare fs://my-container --to ubuntu:24.04
 docker scout quickview fs://my-container
 # More details on CVEs
 docker scout cves fs://my-container"""
-        code = Code(code=code_t, language="shell")
+        code = cached_code(code_t, language="shell")
         self.play(FadeIn(code))
         self.next_slide()
 
-        t31 = Text(f"3.0 Use cases - Optimization on HPC", t2w={"3.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        im = ImageMobject("./images/ThermalMixer.png").scale(0.6)
-        self.play(Transform(title, t31), FadeIn(im))
+    def t30(self):
+        t30 = cached_text(f"3.0 Use cases - Optimization on HPC", t2w={"3.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        im = cached_image("./images/ThermalMixer.png", max_scale=0.6).scale(0.6)
+        self.play(Transform(self.title, t30), FadeIn(im))
         self.next_slide()
         self.play(FadeOut(im))
 
-        objs = Text("- Optimize OpenFOAM cases without installing/compiling OpenFOAM on host:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = cached_text("- Optimize OpenFOAM cases without installing/compiling OpenFOAM on host:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
+        # 4.0 lines up its items with this heading
+        self.objs = objs
         self.play(Create(objs))
 
         items = [
@@ -595,17 +496,16 @@ docker scout cves fs://my-container"""
             "This 'just works' with Apptainer containers because of single-process execution.",
             "Great for heavily customized builds of OpenFOAM..."
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD, f"5{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN, f"5{ITEM_ICON}": GREEN})
+        last = self.itemize(items, objs, 1.5, color=GREEN)
 
-        txt = Text("** Build arguments allow for specialized HPC containers vs. CD containers", font_size=mid_size, color=GRAPH_COLOR).next_to(last, DOWN*2).align_to(title, LEFT)
+        txt = cached_text("** Build arguments allow for specialized HPC containers vs. CD containers", font_size=mid_size, color=GRAPH_COLOR).next_to(last, DOWN*2).align_to(self.title, LEFT)
         self.play(Create(txt))
         self.next_slide()
 
-        t32 = Text(f"3.1 Use cases - OpenFOAM Reflections", t2w={"3.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t32))
+    def t31(self):
+        t31 = cached_text(f"3.1 Use cases - OpenFOAM Reflections", t2w={"3.1": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t31))
         self.next_slide()
 
         code_t = """git clone https://github.com/FoamScience/openfoam-apptainer-packaging /tmp/of_tainers
@@ -623,34 +523,48 @@ apptainer run containers/projects/reflections.sif \\
     "/opt/openfoam-reflections/TUI/tui"
 # Notice the seamless networking and reduced dependencies frustration
 """
-        code = Code(code=code_t, language="shell", insert_line_no=False)
+        code = cached_code(code_t, language="shell", insert_line_no=False)
         self.play(FadeIn(code))
         self.next_slide()
 
-        t40 = Text(f"4.0 Future of HPC containerization", t2w={"4.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t40))
+    def t32(self):
+        t32 = cached_text(f"3.2 Use cases - Native vs. container scaling", t2w={"3.2": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t32))
+        self.next_slide()
+
+        series = load_series("./data/scaling.csv", x="cores", y="runtime", by="build")
+        colors = [interpolate_color(MAIN_COLOR, WARN_COLOR, i/max(1, len(series)-1)) for i in range(len(series))]
+        chart = line_chart(series, "cores", "wall time [s]", colors).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
+        self.play(Create(chart.axes), FadeIn(chart.labels))
+        self.play(LaggedStart(*[Create(graph) for graph in chart.graphs], lag_ratio=0.5), FadeIn(chart.legend))
+        self.next_slide()
+
+    def t40(self):
+        t40 = cached_text(f"4.0 Future of HPC containerization", t2w={"4.0": BOLD}, font_size=big_size).to_edge(UP+LEFT)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, t40))
         self.next_slide()
 
         items = [
             "Kubernetes? -> no queue, no job reports, no profiling...",
             "Kubernetes creating Slurm jobs? -> Why?...",
         ]
-        last = self.itemize(items, objs, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD, f"5{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN, f"5{ITEM_ICON}": GREEN})
+        last = self.itemize(items, self.objs, 1.5, color=GREEN)
 
         items = [
             "(Slurm + Warewulf) will stick around for some more time...",
             "Slurm started to support native OCI containers in 2020...",
             "But we don't need that for Apptainer...",
         ]
-        self.itemize(items, last, 1.5, False,
-            t2w={f"1{ITEM_ICON}": BOLD, f"2{ITEM_ICON}": BOLD, f"3{ITEM_ICON}": BOLD, f"4{ITEM_ICON}": BOLD, f"5{ITEM_ICON}": BOLD},
-            t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN, f"5{ITEM_ICON}": GREEN})
+        self.itemize(items, last, 1.5, color=GREEN)
 
         self.next_slide()
-        tf = Text(f"THANK YOU", t2w={"THANK YOU": BOLD} ,font_size=big_size*2)
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, tf))
+        tf = cached_text(f"THANK YOU", t2w={"THANK YOU": BOLD} ,font_size=big_size*2)
+        keep_only_objects(self, Group(self.layout))
+        self.play(Transform(self.title, tf))
         self.next_slide()
+
+
+# Apptainer_intro, Apptainer_t00, ... render a single section each
+register_section_scenes(Apptainer, globals())
@@ -0,0 +1,628 @@
+"""Build driver for the slide decks, called from produce.sh.
+
+    python build.py render -qh --sections 2.0-2.5
+
+renders the selected sections of a deck as independent manim processes,
+then stitches every section into the single presentation that
+``manim-slides convert`` turns into <Scene>.html. Sections whose code,
+globals and images are unchanged come from the render cache instead.
+
+    python build.py draft --sections 2.0-2.5
+
+skips all animation and saves a low-resolution PNG of every slide's final
+frame under draft/, with draft/index.html showing them as a contact sheet.
+
+    python build.py regress
+
+drafts every slide and reports those whose final frame no longer matches
+its reference under reference/, see regression.py.
+
+    python build.py profile -o after.json --baseline before.json
+
+renders with per-slide profiling and prints where the time went.
+
+    python build.py handout
+
+writes handout/slide-NNN.png and handout.pdf from the rendered clips.
+
+    python build.py submit --store /scratch/$USER/deck-store --backend slurm
+
+renders the sections as a Slurm array job, see cluster.py.
+
+    python build.py estimate --calibrate -q l && python build.py estimate -q k
+
+predicts frames, render time and disk use of a render without running it.
+
+    python build.py ladder Apptainer.html --heights 480,1080,2160
+
+transcodes the clips of a -qk render to lower resolutions and lets the
+player pick one per viewer, see ladder.py.
+
+    python build.py preflight
+
+checks that every image, SVG, data file and font the deck names exists
+and loads, and that LaTeX is installed when the deck typesets with it,
+see preflight.py. render, draft and submit run it first.
+
+    python build.py watch
+
+re-renders the sections whose code or images change and reloads the deck
+in the browser on the edited slide, see watch.py.
+
+    python build.py worker &
+    python build.py --worker render -qh && python build.py --file bayesian.py --scene Bayesian --worker render
+
+renders through a long-lived process that imported manim once, see worker.py.
+"""
+import argparse
+import ast
+import html
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import bundle
+import cluster
+import devserver
+import estimate
+import handout
+import ladder
+import preflight
+import profile_deck
+import regression
+import watch
+import worker
+from postprocess import lazy_preload, optimize
+from render_cache import DeckSource, RenderCache, prune_assets
+
+SLIDES_DIR = Path("slides")
+DRAFT_DIR = Path("draft")
+PROFILE_DIR = Path(".profile")
+ESTIMATE_DIR = Path(".estimate")
+CONVERT_OPTIONS = ["-c", "progress=true", "-c", "controls=true", "-cslide_number=true"]
+
+
+def section_method(number):
+    """Map a section number ("2.0") or method name ("t20") to its method name."""
+    number = number.strip()
+    if number.replace(".", "").isdigit():
+        return "t" + number.replace(".", "")
+    return number
+
+
+def select_sections(sections, selector):
+    """Pick sections from a selector like "2.0-2.5", "intro,3.1" or "all"."""
+    if not selector or selector == "all":
+        return list(sections)
+    selected = []
+    for part in selector.split(","):
+        first, _, last = part.partition("-")
+        first = section_method(first)
+        last = section_method(last) if last else first
+        for name in (first, last):
+            if name not in sections:
+                raise SystemExit(f"Unknown section '{name}', expected one of {', '.join(sections)}")
+        i, j = sections.index(first), sections.index(last)
+        selected += [s for s in sections[i:j+1] if s not in selected]
+    return [s for s in sections if s in selected]
+
+
+def deck_sections(file, scene):
+    """Read the SECTIONS tuple of a deck class without importing manim."""
+    tree = ast.parse(Path(file).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene:
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign) and any(getattr(t, "id", None) == "SECTIONS" for t in stmt.targets):
+                    return list(ast.literal_eval(stmt.value))
+    raise SystemExit(f"{file}: no SECTIONS found in class {scene}")
+
+
+def section_scene(scene, name):
+    return f"{scene}_{name}"
+
+
+def manim_command(args, scene, options=()):
+    """The manim command line and environment rendering a scene with ``args.renderer``."""
+    cmd = ["manim", f"-q{args.quality}", f"--renderer={args.renderer}", *options,
+           str(Path(args.file).resolve()), scene]
+    return cmd, dict(os.environ)
+
+
+def render_section(args, name, options=(), env=None, cwd=None):
+    cmd, base_env = manim_command(args, section_scene(args.scene, name), options)
+    start = time.perf_counter()
+    if args.worker and cmd[0] == "manim":
+        code, log, startup, cold = worker.run(args.worker, cmd, {**base_env, **(env or {})}, cwd)
+        log = f"[worker] started in {startup:.3f}s instead of {cold:.1f}s\n{log}"
+        return name, code, time.perf_counter() - start, log
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                          env={**base_env, **(env or {})}, cwd=cwd)
+    return name, proc.returncode, time.perf_counter() - start, proc.stdout
+
+
+def check_deck(args):
+    start = time.perf_counter()
+    problems = preflight.check(args.file)
+    elapsed = time.perf_counter() - start
+    if problems:
+        raise SystemExit(f"Preflight found {len(problems)} problems in {elapsed:.2f}s:\n" + "\n".join(problems))
+    print(f"Preflight passed in {elapsed:.2f}s")
+
+
+def render(args):
+    if not args.no_preflight:
+        check_deck(args)
+    sections = deck_sections(args.file, args.scene)
+    selected = select_sections(sections, args.sections)
+    source = DeckSource(args.file, args.scene)
+    keys = {name: source.section_key(name, args.quality, args.renderer) for name in selected}
+    cache = RenderCache(max_bytes=args.cache_size << 20)
+    if not args.no_cache:
+        selected = [n for n in selected if not cache.restore(keys[n], section_scene(args.scene, n))]
+    print(f"Rendering {len(selected)}/{len(sections)} sections with {args.jobs} workers")
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for name, code, elapsed, log in pool.map(lambda n: render_section(args, n), selected):
+            print(f"  {name:<8} {'ok' if code == 0 else 'FAILED':<6} {elapsed:7.1f}s")
+            if code != 0:
+                failed.append(name)
+                print(log, file=sys.stderr)
+            elif not args.no_cache:
+                cache.store(keys[name], section_scene(args.scene, name))
+    if not args.no_cache:
+        cache.evict()
+        cache.save()
+        cache.report()
+    if failed:
+        raise SystemExit(f"Failed sections: {', '.join(failed)}")
+    if not args.no_convert:
+        convert(args, sections)
+
+
+def convert(args, sections):
+    scenes = [section_scene(args.scene, name) for name in sections]
+    missing = [s for s in scenes if not (SLIDES_DIR / f"{s}.json").exists()]
+    if missing:
+        raise SystemExit(f"Cannot stitch {args.scene}.html, never rendered: {', '.join(missing)}")
+    subprocess.run(["manim-slides", "convert", "--to", "html", *CONVERT_OPTIONS,
+                    *scenes, f"{args.scene}.html"], check=True)
+    stale = prune_assets(f"{args.scene}.html", f"{args.scene}_assets")
+    if stale:
+        print(f"Removed {len(stale)} stale files from {args.scene}_assets")
+
+
+def draft(args):
+    if not args.no_preflight:
+        check_deck(args)
+    sections = select_sections(deck_sections(args.file, args.scene), args.sections)
+    prefixes = tuple(f"{section_scene(args.scene, n)}_" for n in sections)
+    for old in DRAFT_DIR.glob("*.png"):
+        if old.name.startswith(prefixes):
+            old.unlink()
+    env = {"DECK_DRAFT": str(DRAFT_DIR.resolve())}
+    print(f"Drafting {len(sections)} sections with {args.jobs} workers")
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for name, code, elapsed, log in pool.map(lambda n: render_section(args, n, ["--dry_run"], env), sections):
+            print(f"  {name:<8} {'ok' if code == 0 else 'FAILED':<6} {elapsed:7.1f}s")
+            if code != 0:
+                failed.append(name)
+                print(log, file=sys.stderr)
+    contact_sheet(args.scene, deck_sections(args.file, args.scene))
+    print(f"Contact sheet: {DRAFT_DIR / 'index.html'}")
+    if failed:
+        raise SystemExit(f"Failed sections: {', '.join(failed)}")
+
+
+def regress(args):
+    draft(args)
+    sections = select_sections(deck_sections(args.file, args.scene), args.sections)
+    prefixes = tuple(f"{section_scene(args.scene, n)}_" for n in sections)
+    current = regression.frames(DRAFT_DIR, prefixes)
+    if args.update:
+        regression.update(current, prefixes, jobs=args.jobs)
+        print(f"Stored {len(current)} reference hashes in {regression.REFERENCE_DIR / regression.MANIFEST}, "
+              "commit it with the change")
+        return
+    references = regression.references(prefixes)
+    if not references:
+        raise SystemExit(f"No reference hashes in {regression.REFERENCE_DIR / regression.MANIFEST} to compare with, "
+                         "store the current ones first with: python build.py regress --update")
+    differing = regression.compare(current, references, args.tolerance, args.jobs)
+    print(f"\n{len(current) - len(differing)}/{len(current)} slides match their references")
+    for name, bits in differing:
+        if bits is not None:
+            reason = f"{bits} bits differ"
+        elif name in current:
+            reason = "no reference"
+        else:
+            reason = "slide is gone"
+        print(f"  {name:<32} {reason}")
+    if differing:
+        raise SystemExit(f"{len(differing)} slides differ from {regression.REFERENCE_DIR}/, "
+                         f"compare them in {DRAFT_DIR}/ or accept them with --update")
+
+
+def contact_sheet(scene, sections):
+    """Write draft/index.html, a grid of the drafted slides grouped by section."""
+    rows = []
+    for name in sections:
+        frames = sorted(DRAFT_DIR.glob(f"{section_scene(scene, name)}_*.png"))
+        if not frames:
+            continue
+        cells = "".join(f'<figure><a href="{f.name}"><img src="{f.name}" loading="lazy"></a>'
+                        f'<figcaption>{f.stem.rsplit("_", 1)[1]}</figcaption></figure>' for f in frames)
+        rows.append(f"<h2>{html.escape(name)}</h2><div class=grid>{cells}</div>")
+    DRAFT_DIR.mkdir(exist_ok=True)
+    (DRAFT_DIR / "index.html").write_text(f"""<!doctype html>
+<meta charset="utf-8">
+<title>{html.escape(scene)} draft</title>
+<style>
+  body {{ font-family: sans-serif; background: #222; color: #ddd; margin: 1em; }}
+  .grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 8px; }}
+  figure {{ margin: 0; }}
+  img {{ width: 100%; display: block; }}
+  figcaption {{ font-size: small; text-align: right; }}
+</style>
+<h1>{html.escape(scene)}</h1>
+{chr(10).join(rows)}
+""")
+
+
+def profile(args):
+    sections = select_sections(deck_sections(args.file, args.scene), args.sections)
+    env = {"DECK_PROFILE": str(PROFILE_DIR.resolve())}
+    print(f"Profiling {len(sections)} sections with {args.jobs} workers")
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for name, code, elapsed, log in pool.map(lambda n: render_section(args, n, env=env), sections):
+            print(f"  {name:<8} {'ok' if code == 0 else 'FAILED':<6} {elapsed:7.1f}s")
+            if code != 0:
+                failed.append(name)
+                print(log, file=sys.stderr)
+    if failed:
+        raise SystemExit(f"Failed sections: {', '.join(failed)}")
+    report = profile_deck.merge(PROFILE_DIR, {n: section_scene(args.scene, n) for n in sections})
+    report["quality"] = args.quality
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}\n")
+    profile_deck.summary(report)
+    if args.baseline:
+        print()
+        compare_reports(argparse.Namespace(baseline=args.baseline, report=args.output, threshold=args.threshold))
+
+
+def compare_reports(args):
+    baseline = json.loads(Path(args.baseline).read_text())
+    report = json.loads(Path(args.report).read_text())
+    if baseline.get("quality") != report.get("quality"):
+        print(f"Warning: comparing -q{baseline.get('quality')} against -q{report.get('quality')}")
+    slower = profile_deck.compare(baseline, report, args.threshold / 100)
+    if slower:
+        raise SystemExit(f"Slower by more than {args.threshold}%: {', '.join(slower)}")
+
+
+def export_handout(args):
+    if args.html and Path(args.html).exists():
+        sources = handout.html_slides(args.html)
+        print(f"Exporting {len(sources)} slides from {args.html}")
+    else:
+        sections = deck_sections(args.file, args.scene)
+        source = DeckSource(args.file, args.scene)
+        sources = [clip for name in sections
+                   for clip in handout.scene_slides(section_scene(args.scene, name),
+                                                     source.section_key(name, args.quality, args.renderer))]
+        print(f"Exporting {len(sources)} slides from the rendered sections")
+    images = handout.export(sources, args.output, pdf=f"{args.output}.pdf", jobs=args.jobs)
+    print(f"Wrote {len(images)} pages to {args.output}/ and {args.output}.pdf")
+
+
+def estimate_render(args):
+    calibration_file = ESTIMATE_DIR / "calibration.json"
+    calibrations = json.loads(calibration_file.read_text()) if calibration_file.exists() else {}
+    if args.calibrate:
+        sections = select_sections(deck_sections(args.file, args.scene), args.sections)
+        path = estimate.workdir(ESTIMATE_DIR / f"{args.renderer}-{args.quality}")
+        env = {"DECK_PROFILE": str((path / "profile").resolve())}
+        print(f"Calibrating -q{args.quality} on {len(sections)} sections")
+        for name in sections:
+            name, code, elapsed, log = render_section(args, name, env=env, cwd=path)
+            print(f"  {name:<8} {'ok' if code == 0 else 'FAILED':<6} {elapsed:7.1f}s")
+            if code != 0:
+                raise SystemExit(log)
+        scenes = {name: section_scene(args.scene, name) for name in sections}
+        report = profile_deck.merge(path / "profile", scenes)
+        # manim-slides writes every slide forwards and reversed
+        slide_bytes = [(path / "slides" / "files" / scene / Path(slide[k]).name).stat().st_size
+                       for scene in scenes.values()
+                       for slide in json.loads((path / "slides" / f"{scene}.json").read_text())["slides"]
+                       for k in ("file", "rev_file")]
+        calibration = estimate.calibrate(report, slide_bytes, args.quality)
+        calibrations[f"{args.renderer}-{args.quality}"] = calibration
+        calibration_file.write_text(json.dumps(calibrations, indent=2))
+        print(f"Calibrated from {calibration['slides']} slides: {calibration['per_frame']*1e3:.1f} ms/frame "
+              f"+ {calibration['per_point']*1e6:.3f} µs/point/frame, {calibration['per_play']:.2f} s/partial movie, "
+              f"{calibration['bytes_per_frame']/1024:.1f} KiB/frame")
+        return
+    candidates = [c for key, c in calibrations.items() if key.startswith(f"{args.renderer}-")]
+    if not candidates:
+        raise SystemExit(f"No calibration for {args.renderer} yet, run: build.py estimate --calibrate -q l")
+    # The calibration closest in pixels to the target is scaled the least
+    pixels = lambda q: estimate.QUALITIES[q][0] * estimate.QUALITIES[q][1]
+    calibration = min(candidates, key=lambda c: abs(pixels(c["quality"]) - pixels(args.quality)))
+    plan_file = (ESTIMATE_DIR / "plan.json").resolve()
+    cmd, env = manim_command(argparse.Namespace(**{**vars(args), "quality": "l"}), args.scene, ["--dry_run"])
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                          env={**env, "DECK_ESTIMATE": str(plan_file)})
+    if proc.returncode != 0:
+        raise SystemExit(proc.stdout)
+    print(f"Dry run of {args.scene} took {time.perf_counter() - start:.1f}s, "
+          f"calibrated at -q{calibration['quality']}\n")
+    predictions = estimate.predict(json.loads(plan_file.read_text()), calibration, args.quality)
+    estimate.report(predictions, args.quality, args.jobs)
+
+
+def submit(args):
+    if not args.no_preflight:
+        check_deck(args)
+    sections = deck_sections(args.file, args.scene)
+    source = DeckSource(args.file, args.scene)
+    store = Path(args.store)
+    items = []
+    for name in select_sections(sections, args.sections):
+        key = source.section_key(name, args.quality, args.renderer)
+        if not (store / key / f"{section_scene(args.scene, name)}.json").exists():
+            items.append((name, key))
+    manifest_file = cluster.submission_dir() / "manifest.json"
+    cluster.write_manifest(manifest_file, args, items, store)
+    array, gather = cluster.write_scripts(args, manifest_file, len(items))
+    print(f"{len(items)}/{len(sections)} sections to render, store {store}")
+    if args.backend == "slurm":
+        cluster.submit_slurm(array, gather, len(items))
+    else:
+        cluster.run_local(array, gather, len(items), args.jobs)
+
+
+def work(args):
+    manifest = cluster.read_manifest(args.manifest)
+    item = manifest["items"][args.index]
+    args.quality, args.renderer = manifest["quality"], manifest["renderer"]
+    scene = section_scene(args.scene, item["section"])
+    store = RenderCache(root=manifest["store"])
+    if (store.root / item["key"] / f"{scene}.json").exists():
+        print(f"{scene} is already in the store")
+        return
+    name, code, elapsed, log = render_section(args, item["section"])
+    print(log)
+    if code != 0:
+        raise SystemExit(f"{scene} failed after {elapsed:.1f}s")
+    store.store(item["key"], scene)
+    print(f"{scene} rendered in {elapsed:.1f}s, stored as {item['key']}")
+
+
+def gather(args):
+    manifest = cluster.read_manifest(args.manifest)
+    args.quality, args.renderer = manifest["quality"], manifest["renderer"]
+    sections = deck_sections(args.file, args.scene)
+    source = DeckSource(args.file, args.scene)
+    store = RenderCache(root=manifest["store"])
+    for name in sections:
+        store.restore(source.section_key(name, args.quality, args.renderer), section_scene(args.scene, name))
+    store.save()
+    store.report()
+    convert(args, sections)
+
+
+def watch_deck(args):
+    render_args = argparse.Namespace(**vars(args), sections="all", no_convert=False, no_cache=False,
+                                     no_preflight=False)
+    state = {"source": DeckSource(args.file, args.scene)}
+    state["keys"] = {n: state["source"].section_key(n, args.quality, args.renderer) for n in state["source"].sections}
+    try:
+        render(render_args)
+    except SystemExit as e:
+        print(f"First render failed, watching anyway: {e}")
+
+    def rebuild():
+        before, after = state["source"], DeckSource(args.file, args.scene)
+        keys = {n: after.section_key(n, args.quality, args.renderer) for n in after.sections}
+        changed = [n for n in after.sections if keys[n] != state["keys"].get(n)]
+        if not changed:
+            return None
+        render_args.sections = ",".join(changed)
+        render(render_args)
+        state.update(source=after, keys=keys)
+        return watch.first_edited_slide(before, after, changed, args.scene, SLIDES_DIR)
+
+    def watched():
+        # The modules the cache keys hash, picked up again when an edit adds an import
+        source = state["source"]
+        return [p for p in (source.file, *source.modules, Path("images"), Path("data")) if p.exists()]
+
+    watch.watch(watched, rebuild, f"{args.scene}.html", port=args.port,
+                interval=args.interval)
+
+
+def optimize_deck(args):
+    optimize(args.html, codec=args.codec, crf=args.crf, jobs=args.jobs, reencode_clips=not args.no_reencode,
+             stills=not args.no_stills)
+
+
+def bundle_deck(args):
+    index = bundle.bundle(args.html, bundle.section_titles(args.file, args.scene),
+                          codec=args.codec, crf=args.crf, ahead=args.ahead)
+    size = Path(args.html).parent / index["bundle"]
+    print(f"Bundled {len(index['slides'])} slide clips into {index['bundle']} "
+          f"({size.stat().st_size/2**20:.2f} MiB), index next to it")
+
+
+def ladder_deck(args):
+    heights = [int(h.strip().rstrip("p")) for h in args.heights.split(",")]
+    manifest = ladder.ladder(args.html, heights, codec=args.codec, jobs=args.jobs)
+    root = Path(args.html).parent
+    print(f"Renditions of {len(manifest['clips'])} clips, manifest in {Path(manifest['slides'][0]['source']).parent}/renditions.json")
+    for h in manifest["heights"]:
+        size = sum((root / clip[h]).stat().st_size for clip in manifest["clips"].values())
+        print(f"  {h:>5}p {size/2**20:9.2f} MiB {manifest['kbps'][h]:9.0f} kbit/s")
+
+
+def preload(args):
+    lazy_preload(args.html, ahead=args.ahead)
+
+
+def serve_worker(args):
+    worker.serve(args.socket)
+
+
+def serve(args):
+    devserver.serve(port=args.port, log_file=args.log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default="apptainer.py", help="deck source file")
+    parser.add_argument("--scene", default="Apptainer", help="deck class")
+    parser.add_argument("--worker", nargs="?", const=str(worker.SOCKET_PATH),
+                        help="render through a running render worker on this socket")
+    # The deck is only made and checked to render with Cairo
+    parser.set_defaults(renderer="cairo")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("render", help="render sections in parallel and stitch the deck")
+    p.add_argument("-q", dest="quality", default="h", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--sections", default="all", help="eg. 2.0-2.5 or intro,3.1 (default: all)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes")
+    p.add_argument("--no-convert", action="store_true", help="skip manim-slides convert")
+    p.add_argument("--no-cache", action="store_true", help="render even if the section is cached")
+    p.add_argument("--cache-size", type=int, default=2048, help="render cache budget in MB")
+    p.add_argument("--no-preflight", action="store_true", help="skip checking images and fonts first")
+    p.set_defaults(func=render)
+
+    p = commands.add_parser("preflight", help="check the deck's images, SVGs, data files, fonts and LaTeX")
+    p.set_defaults(func=check_deck)
+
+    p = commands.add_parser("draft", help="save each slide's final frame as PNG plus a contact sheet")
+    p.add_argument("-q", dest="quality", default="l", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--sections", default="all", help="eg. 2.0-2.5 or intro,3.1 (default: all)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes")
+    p.add_argument("--no-preflight", action="store_true", help="skip checking images and fonts first")
+    p.set_defaults(func=draft)
+
+    p = commands.add_parser("regress", help="compare each slide's final frame with its reference frame")
+    p.add_argument("-q", dest="quality", default="l", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--sections", default="all", help="eg. 2.0-2.5 or intro,3.1 (default: all)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes")
+    p.add_argument("--tolerance", type=int, default=6, help="perceptual hash bits (of 64) allowed to differ")
+    p.add_argument("--update", action="store_true", help="store the frames as the new references")
+    p.add_argument("--no-preflight", action="store_true", help="skip checking images and fonts first")
+    p.set_defaults(func=regress)
+
+    p = commands.add_parser("profile", help="render with per-slide profiling and report the timings")
+    p.add_argument("-q", dest="quality", default="h", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--sections", default="all", help="eg. 2.0-2.5 or intro,3.1 (default: all)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes")
+    p.add_argument("-o", "--output", default="profile.json", help="JSON report to write")
+    p.add_argument("--baseline", help="report of an earlier run to compare against")
+    p.add_argument("--threshold", type=float, default=10, help="percent slowdown reported as a regression")
+    p.set_defaults(func=profile)
+
+    p = commands.add_parser("compare", help="compare two profile reports section by section")
+    p.add_argument("baseline")
+    p.add_argument("report")
+    p.add_argument("--threshold", type=float, default=10, help="percent slowdown reported as a regression")
+    p.set_defaults(func=compare_reports)
+
+    p = commands.add_parser("handout", help="export the last frame of every slide as PNGs and a PDF")
+    p.add_argument("html", nargs="?", default="Apptainer.html", help="converted deck to take the clips from")
+    p.add_argument("-q", dest="quality", default="h", choices="lmhpk",
+                   help="quality to look up in the render cache when there is no converted deck")
+    p.add_argument("-o", "--output", default="handout", help="PNG folder, also the PDF name")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel ffmpeg processes")
+    p.set_defaults(func=export_handout)
+
+    p = commands.add_parser("estimate", help="predict frames, render time and size without rendering")
+    p.add_argument("-q", dest="quality", default="h", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--calibrate", action="store_true", help="measure this machine by rendering sections at -q")
+    p.add_argument("--sections", default="intro,t11,t31", help="sections to calibrate on")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes to assume")
+    p.set_defaults(func=estimate_render)
+
+    p = commands.add_parser("submit", help="render sections as a Slurm array job into a shared store")
+    p.add_argument("-q", dest="quality", default="h", choices="lmhpk", help="manim quality flag")
+    p.add_argument("--sections", default="all", help="eg. 2.0-2.5 or intro,3.1 (default: all)")
+    p.add_argument("--store", default=".render-cache", help="content-addressed directory all nodes can reach")
+    p.add_argument("--backend", default="slurm", choices=("slurm", "local"),
+                   help="submit with sbatch, or run the job scripts here as a fake scheduler")
+    p.add_argument("--sbatch", action="append", default=[], help="extra #SBATCH option, eg. --partition=gpu")
+    p.add_argument("--launcher", default="", help="command prefix on the nodes, eg. 'apptainer exec manim.sif'")
+    p.add_argument("--max-parallel", type=int, default=16, help="array tasks running at once")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="tasks at once with the local backend")
+    p.add_argument("--no-preflight", action="store_true", help="skip checking images and fonts first")
+    p.set_defaults(func=submit)
+
+    p = commands.add_parser("work", help="render one array task of a submitted manifest (run by the job)")
+    p.add_argument("manifest")
+    p.add_argument("index", type=int)
+    p.set_defaults(func=work)
+
+    p = commands.add_parser("gather", help="restore all sections from the store and stitch the deck (run by the job)")
+    p.add_argument("manifest")
+    p.set_defaults(func=gather)
+
+    p = commands.add_parser("watch", help="re-render edited sections on change and reload the browser")
+    p.add_argument("-q", dest="quality", default="l", choices="lmhpk", help="manim quality flag")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel manim processes")
+    p.add_argument("--cache-size", type=int, default=2048, help="render cache budget in MB")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--interval", type=float, default=0.5, help="seconds between checks for changes")
+    p.set_defaults(func=watch_deck)
+
+    p = commands.add_parser("optimize", help="dedup, freeze static and re-encode the clips of a converted deck")
+    p.add_argument("html", nargs="?", default="Apptainer.html")
+    p.add_argument("--codec", default="libx264", help="ffmpeg video encoder")
+    p.add_argument("--crf", type=int, default=28, help="constant rate factor for the encoder")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel ffmpeg processes")
+    p.add_argument("--no-reencode", action="store_true", help="only fold duplicate clips")
+    p.add_argument("--no-stills", action="store_true", help="keep clips without visual change as videos")
+    p.set_defaults(func=optimize_deck)
+
+    p = commands.add_parser("ladder", help="transcode the clips to several resolutions for the player to pick from")
+    p.add_argument("html", nargs="?", default="Apptainer.html")
+    p.add_argument("--heights", default="480,1080,2160", help="rungs of the ladder, up to the render's height")
+    p.add_argument("--codec", default="libx264", help="ffmpeg video encoder")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="parallel ffmpeg processes")
+    p.set_defaults(func=ladder_deck)
+
+    p = commands.add_parser("preload", help="make the player fetch only a window of slide videos")
+    p.add_argument("html", nargs="?", default="index.html")
+    p.add_argument("--ahead", type=int, default=2, help="slides to fetch ahead of the current one")
+    p.set_defaults(func=preload)
+
+    p = commands.add_parser("bundle", help="pack all slide clips into one fragmented MP4 with a byte-range index")
+    p.add_argument("html", nargs="?", default="index.html")
+    p.add_argument("--codec", default="libx264", help="ffmpeg video encoder, H.264 for MediaSource")
+    p.add_argument("--crf", type=int, default=28, help="constant rate factor for the encoder")
+    p.add_argument("--ahead", type=int, default=2, help="slides to fetch ahead of the current one")
+    p.set_defaults(func=bundle_deck)
+
+    p = commands.add_parser("worker", help="keep manim imported and render jobs sent over a local socket")
+    p.add_argument("--socket", default=str(worker.SOCKET_PATH), help="Unix socket to listen on")
+    p.set_defaults(func=serve_worker)
+
+    p = commands.add_parser("serve", help="serve the deck locally, logging requests per slide")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--log", help="also write the per-slide requests to this JSON file")
+    p.set_defaults(func=serve)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
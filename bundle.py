@@ -0,0 +1,259 @@
+"""All slide clips of a converted deck in one fragmented MP4.
+
+``bundle`` re-encodes the deck's clips, in slide order, into
+``<assets>/bundle.mp4`` with a keyframe at every slide start. Because the
+file is fragmented and its ``moov`` comes first, each slide's frames are a
+contiguous byte range of ``moof``/``mdat`` pairs. ``bundle.json`` records
+the initialization segment, then per slide the time span, byte range and
+section title. The injected player appends the initialization segment and
+then each slide's range (the next ones ahead of time) to a MediaSource, so
+the deck costs one small file plus a few range requests instead of a file
+per slide. Slides shown as stills keep their image backgrounds.
+"""
+import ast
+import json
+import re
+import struct
+import subprocess
+import tempfile
+from pathlib import Path
+
+from postprocess import ffmpeg
+from render_cache import DeckSource
+
+BUNDLE_MARKER = "<!-- deck: bundle -->"
+# data-deck-video is a background video after lazy_preload
+VIDEO_ATTR = r'data-(?:background|deck)-video="([^"]+)"'
+SECTION_RE = re.compile(r'(<section\b[^>]*?)\s+' + VIDEO_ATTR + r'([^>]*>)', re.S)
+BUNDLE_PLAYER = """<video id="deck-bundle" muted playsinline
+      style="position: fixed; inset: 0; width: 100%%; height: 100%%; object-fit: contain; background: #222"></video>
+    <script>
+      (function () {
+        var AHEAD = %(ahead)d, INDEX = "%(index)s";
+        var video = document.getElementById("deck-bundle");
+        var reveal = document.querySelector(".reveal");
+        reveal.style.position = "fixed";
+        reveal.style.zIndex = 1;
+        fetch(INDEX).then(function (r) { return r.json(); }).then(function (index) {
+          var slides = {}, loaded = {}, current = null, buffer, queue;
+          index.slides.forEach(function (s) { slides[s.slide] = s; });
+          function range(r) {
+            return fetch(index.bundle, {headers: {Range: "bytes=" + r[0] + "-" + (r[1] - 1)}})
+              .then(function (res) { return res.arrayBuffer(); });
+          }
+          function append(data) {
+            return new Promise(function (resolve) {
+              buffer.addEventListener("updateend", resolve, {once: true});
+              buffer.appendBuffer(data);
+            });
+          }
+          function load(s) {
+            if (s && !loaded[s.slide]) {
+              loaded[s.slide] = true;
+              queue = queue.then(function () { return range(s.range); }).then(append);
+            }
+            return queue;
+          }
+          function hold() {
+            // Stop on the slide's last frame, or start over for looping slides
+            if (!current || video.currentTime < current.end - index.frame) return false;
+            if (current.loop) { video.currentTime = current.start; return false; }
+            video.pause();
+            video.currentTime = current.end - index.frame / 2;
+            return true;
+          }
+          function watch() {
+            if (video.requestVideoFrameCallback) {
+              video.requestVideoFrameCallback(function () { if (!hold()) watch(); });
+            }
+          }
+          function show(i) {
+            var s = slides[i];
+            current = null;
+            video.pause();
+            video.style.visibility = s ? "visible" : "hidden";
+            if (s) {
+              load(s).then(function () {
+                current = s;
+                video.currentTime = s.start;
+                video.play();
+                watch();
+              });
+            }
+            for (var j = 1; j <= AHEAD; j++) load(slides[i + j]);
+          }
+          video.addEventListener("timeupdate", hold);
+          var source = new MediaSource();
+          source.addEventListener("sourceopen", function () {
+            buffer = source.addSourceBuffer(index.mime);
+            queue = range(index.init).then(append);
+            show(Reveal.isReady() ? Reveal.getIndices().h : 0);
+            Reveal.on("slidechanged", function (e) {
+              show(e.indexh);
+              if (/[?&]trace\\b/.test(location.search)) fetch("__slide/" + e.indexh, {cache: "no-store"});
+            });
+          });
+          video.src = URL.createObjectURL(source);
+        });
+      })();
+    </script>"""
+
+
+def boxes(data, start=0, end=None):
+    """(type, offset, size, header size) of the MP4 boxes in data[start:end]."""
+    end = len(data) if end is None else end
+    while start + 8 <= end:
+        size, kind = struct.unpack(">I4s", data[start:start+8])
+        header = 8
+        if size == 1:
+            size, header = struct.unpack(">Q", data[start+8:start+16])[0], 16
+        elif size == 0:
+            size = end - start
+        yield kind.decode("latin-1"), start, size, header
+        start += size
+
+
+def find(data, path, start=0, end=None):
+    """Offset and end of the payload of the first box along a path like "moov/trak/mdia"."""
+    first, _, rest = path.partition("/")
+    for kind, offset, size, header in boxes(data, start, end):
+        if kind == first:
+            if not rest:
+                return offset + header, offset + size
+            return find(data, rest, offset + header, offset + size)
+    raise ValueError(f"No {path} box")
+
+
+def codec_mime(data):
+    """MediaSource type of an H.264 MP4, eg. video/mp4; codecs="avc1.64001f"."""
+    stsd, end = find(data, "moov/trak/mdia/minf/stbl/stsd")
+    # stsd: version/flags, entry count, then the avc1 sample entry (78 bytes) holding avcC
+    entry = stsd + 8
+    avcc, _ = find(data, "avcC", entry + 8 + 78, end)
+    profile, compat, level = data[avcc+1:avcc+4]
+    return f'video/mp4; codecs="avc1.{profile:02x}{compat:02x}{level:02x}"'
+
+
+def fragments(data):
+    """(offset, start time in seconds) of each moof, and where the init segment ends."""
+    mdhd, _ = find(data, "moov/trak/mdia/mdhd")
+    version = data[mdhd]
+    timescale = struct.unpack(">I", data[mdhd+20:mdhd+24] if version == 1 else data[mdhd+12:mdhd+16])[0]
+    frags, init_end = [], None
+    for kind, offset, size, header in boxes(data):
+        if kind == "moof":
+            init_end = offset if init_end is None else init_end
+            tfdt, _ = find(data, "traf/tfdt", offset + header, offset + size)
+            fmt = ">Q" if data[tfdt] == 1 else ">I"
+            frags.append((offset, struct.unpack(fmt, data[tfdt+4:tfdt+4+struct.calcsize(fmt)])[0] / timescale))
+    return frags, init_end
+
+
+def duration(video):
+    out = subprocess.run(["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(video)],
+                         check=True, stdout=subprocess.PIPE, text=True).stdout
+    return float(out)
+
+
+def frame_rate(video):
+    out = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=r_frame_rate",
+                          "-of", "csv=p=0", str(video)], check=True, stdout=subprocess.PIPE, text=True).stdout
+    num, _, den = out.strip().partition("/")
+    return float(num) / float(den or 1)
+
+
+def heading(method, name):
+    """Constant text of a section's heading, or None.
+
+    A deck names a section's heading after the section (``t10 =
+    cached_text("1.0 ...")``), the title page assigns it to ``self.title``.
+    Any other text is slide content, so nothing else is taken as a heading.
+    """
+    for node in ast.walk(method):
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1):
+            continue
+        target = node.targets[0]
+        if not (getattr(target, "id", None) == name
+                or (getattr(target, "attr", None) == "title" and getattr(target.value, "id", None) == "self")):
+            continue
+        call = node.value
+        # Methods chained on the text, eg. .to_edge(UP+LEFT), wrap the cached_text call
+        while isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute):
+            call = call.func.value
+        if isinstance(call, ast.Call) and getattr(call.func, "id", None) == "cached_text" and call.args:
+            arg = call.args[0]
+            parts = arg.values if isinstance(arg, ast.JoinedStr) else [arg]
+            if all(isinstance(p, ast.Constant) for p in parts):
+                return "".join(p.value for p in parts)
+    return None
+
+
+def section_titles(file, scene, slides_dir=Path("slides")):
+    """Per slide of the deck, the section it is in and that section's heading.
+
+    Sections without a constant heading are titled with their name.
+    """
+    source = DeckSource(file, scene)
+    titles = []
+    for name in source.sections:
+        method = source.methods.get(name)
+        title = (heading(method, name) if method else None) or name
+        config = Path(slides_dir) / f"{scene}_{name}.json"
+        count = len(json.loads(config.read_text())["slides"]) if config.exists() else 0
+        titles += [(name, title)] * count
+    return titles
+
+
+def bundle(html, titles=(), codec="libx264", crf=28, ahead=2):
+    """Pack a deck's clips into one fragmented MP4 and switch its HTML to the bundle player."""
+    html = Path(html)
+    text = html.read_text()
+    if BUNDLE_MARKER in text:
+        raise SystemExit(f"{html} already plays from a bundle")
+    root = html.parent
+    slides = re.findall(r"<section\b.*?</section>", text, re.S)
+    clips = [(i, root / m.group(1), "data-background-video-loop" in s)
+             for i, s in enumerate(slides) for m in [re.search(VIDEO_ATTR, s)] if m]
+    if not clips:
+        raise SystemExit(f"{html} has no slide videos to bundle")
+    assets = clips[0][1].parent
+    durations = [duration(c) for _, c, _ in clips]
+    fps = frame_rate(clips[0][1])
+    starts = [sum(durations[:k]) for k in range(len(clips))]
+
+    out = assets / "bundle.mp4"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        listing.writelines(f"file '{c.resolve()}'\n" for _, c, _ in clips)
+    try:
+        ffmpeg("-f", "concat", "-safe", "0", "-i", listing.name, "-c:v", codec, "-crf", str(crf),
+               "-pix_fmt", "yuv420p", "-force_key_frames", ",".join(f"{s:.6f}" for s in starts),
+               "-movflags", "+frag_keyframe+empty_moov+default_base_moof", "-an", str(out))
+    finally:
+        Path(listing.name).unlink()
+
+    data = out.read_bytes()
+    frags, init_end = fragments(data)
+    eps = 0.5 / fps
+
+    def first_fragment(t):
+        return next((o for o, s in frags if s >= t - eps), len(data))
+
+    index = {"bundle": str(out.relative_to(root)), "mime": codec_mime(data), "init": [0, init_end],
+             "frame": 1 / fps, "slides": []}
+    for (i, _, loop), start, length in zip(clips, starts, durations):
+        section, title = titles[i] if i < len(titles) else (None, None)
+        index["slides"].append({"slide": i, "section": section, "title": title, "start": start,
+                                "end": start + length, "loop": loop,
+                                "range": [first_fragment(start), first_fragment(start + length)]})
+    index_file = assets / "bundle.json"
+    index_file.write_text(json.dumps(index, indent=2))
+
+    # Bundled slides drop their own video and background color, the player shows through
+    text = SECTION_RE.sub(lambda m: re.sub(r'\s+data-background-color="[^"]*"', "", m.group(1))
+                          + re.sub(r"\s+data-background-video-\w+", "", m.group(3)), text)
+    player = BUNDLE_PLAYER % {"ahead": ahead, "index": index_file.relative_to(root)}
+    init = text.index("Reveal.initialize(")
+    script = text.rindex("<script", 0, init)
+    text = f"{text[:script]}{BUNDLE_MARKER}\n    {player}\n    {text[script:]}"
+    html.write_text(text)
+    return index
@@ -0,0 +1,120 @@
+"""Line charts from OpenFOAM timing and scaling logs.
+
+    series = load_series("./data/scaling.csv", x="cores", y="runtime", by="build")
+    chart = line_chart(series, "cores", "wall time [s]", colors)
+    self.play(Create(chart))
+
+A log is read with pandas once, split into one series per ``by`` value,
+sorted along x and cut down to at most ``points`` vertices per series with
+Largest-Triangle-Three-Buckets, which keeps peaks and the curve's shape
+where plain striding would drop them. The result is stored as a columnar
+file under ``.chart-cache/`` keyed on the log's content, so later renders
+neither parse the CSV nor downsample again.
+"""
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from manim import DOWN, LEFT, ORIGIN, RIGHT, UR, Axes, Line, VGroup, logger
+
+from mobject_cache import cached_text, file_digest
+
+CACHE_DIR = Path(".chart-cache")
+# Series with at most this many points get a dot on each vertex
+MAX_DOTTED = 32
+
+
+def lttb(x, y, n):
+    """Indices of ``n`` points of (x, y) chosen by Largest-Triangle-Three-Buckets."""
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    # First and last points are kept, the rest is split into n-2 buckets
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i+1]
+        # The next bucket is represented by its mean, the last one by the last point
+        nlo, nhi = (edges[i+1], edges[i+2]) if i + 2 < n - 1 else (size - 1, size)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i+1] = a
+    return keep
+
+
+def _read_cached(path):
+    """The frame cached under ``path`` (parquet or npz, whichever was written), or None."""
+    npz = path.with_suffix(".npz")
+    try:
+        if path.exists():
+            return pd.read_parquet(path)
+        if npz.exists():
+            with np.load(npz, allow_pickle=False) as data:
+                return pd.DataFrame({k: data[k] for k in data.files})
+    except Exception as e:
+        # eg. a parquet entry read where no engine is installed any more
+        logger.warning(f"Ignoring unreadable chart cache entry {path.stem}: {e}")
+    return None
+
+
+def _write_cached(frame, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        frame.to_parquet(path, index=False)
+    except ImportError:
+        # No parquet engine installed: NumPy arrays per column instead, labels as
+        # fixed-width strings since object arrays cannot be loaded without pickle
+        columns = {c: frame[c].to_numpy() if pd.api.types.is_numeric_dtype(frame[c])
+                   else np.asarray(frame[c].astype(str), dtype=str) for c in frame.columns}
+        np.savez(path.with_suffix(".npz"), **columns)
+
+
+def load_series(path, x, y, by=None, points=500):
+    """``{label: (x, y)}`` arrays from a CSV log, downsampled to ``points`` per series."""
+    key = hashlib.sha256(f"{file_digest(path)} {x} {y} {by} {points}".encode()).hexdigest()
+    cached = CACHE_DIR / f"{key}.parquet"
+    label = by or "series"
+    frame = _read_cached(cached)
+    if frame is None:
+        frame = pd.read_csv(path, comment="#", usecols=[x, y] + ([by] if by else []), skipinitialspace=True)
+        frame = frame.dropna()
+        if by is None:
+            frame[label] = y
+        parts = []
+        for _, group in frame.groupby(label, sort=False):
+            group = group.sort_values(x, kind="stable")
+            parts.append(group.iloc[lttb(group[x].to_numpy(float), group[y].to_numpy(float), points)])
+        frame = pd.concat(parts, ignore_index=True)
+        _write_cached(frame, cached)
+    return {str(name): (group[x].to_numpy(float), group[y].to_numpy(float))
+            for name, group in frame.groupby(label, sort=False)}
+
+
+def _axis_range(values, ticks=5):
+    low, high = float(min(values.min(), 0)), float(values.max())
+    step = 10 ** np.floor(np.log10((high - low) / ticks or 1))
+    step *= next(m for m in (1, 2, 5, 10) if (high - low) / (step * m) <= ticks)
+    return [low, np.ceil(high / step) * step, step]
+
+
+def line_chart(series, x_label, y_label, colors, width=9, height=4.5):
+    """Axes with one line graph per series and a legend; ``chart.axes`` and ``chart.graphs`` for animating."""
+    xs = np.concatenate([x for x, _ in series.values()])
+    ys = np.concatenate([y for _, y in series.values()])
+    axes = Axes(x_range=_axis_range(xs), y_range=_axis_range(ys), x_length=width, y_length=height,
+                tips=False, axis_config={"include_numbers": True, "font_size": 16})
+    labels = VGroup(cached_text(x_label).next_to(axes.x_axis, DOWN),
+                    cached_text(y_label).rotate(np.pi / 2).next_to(axes.y_axis, LEFT))
+    graphs = VGroup(*[axes.plot_line_graph(x, y, line_color=color, add_vertex_dots=len(x) <= MAX_DOTTED,
+                                           vertex_dot_style={"color": color})
+                      for (x, y), color in zip(series.values(), colors)])
+    legend = VGroup(*[VGroup(Line(ORIGIN, 0.4 * RIGHT, color=color), cached_text(name)).arrange(RIGHT)
+                      for name, color in zip(series, colors)]).arrange(DOWN, aligned_edge=LEFT)
+    legend.next_to(axes.get_corner(UR), DOWN + LEFT)
+    chart = VGroup(axes, labels, graphs, legend)
+    chart.axes, chart.labels, chart.graphs, chart.legend = axes, labels, graphs, legend
+    return chart
@@ -0,0 +1,86 @@
+"""Scene state saved at section boundaries.
+
+A section scene renders one section, but ``construct`` has to run every
+section before it (with animations skipped) to rebuild the state it starts
+from: the ``layout`` group, the ``title`` each section transforms, and so
+on. That state is the scene's mobjects plus the deck attributes sections
+assign (``self.title``, ``self.layout``, ...). It is saved before the
+section runs its ``keep_only_objects``, so a checkpoint holds everything
+the previous section left on screen, not just what the section keeps; a
+section with many mobjects makes a large one. ``Checkpoints`` pickles it
+under ``.checkpoints/<key>.pkl`` when a render reaches a section, and a
+later render of that section or any after it restores the nearest
+checkpoint and starts there.
+
+The key of the checkpoint before a section chains the render cache keys
+(see render_cache.py) of all sections before it, so editing any of them,
+the helpers and globals they use, the images they load or a module the
+deck imports makes their checkpoints miss. State outside the scene, like
+module-level variables changed by a section, is not saved; decks that rely
+on it set ``DECK_CHECKPOINTS=`` (empty) to always replay.
+"""
+import ast
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+
+from manim import config, logger
+
+from render_cache import DeckSource
+
+CHECKPOINT_DIR = os.environ.get("DECK_CHECKPOINTS", ".checkpoints")
+VERSION = 1
+
+
+class Checkpoints:
+
+    def __init__(self, deck_class, root=CHECKPOINT_DIR):
+        self.root = Path(root)
+        source = DeckSource(sys.modules[deck_class.__module__].__file__, deck_class.__name__)
+        quality = f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate}"
+        self.keys = {}
+        h = hashlib.sha256(f"v{VERSION}\n".encode())
+        for name in source.sections:
+            self.keys[name] = h.hexdigest()
+            h.update(source.section_key(name, quality, str(config.renderer)).encode())
+        # Deck attributes the sections and their helpers assign
+        self.attributes = sorted({a for node in source.methods.values() for a in source.attributes(node, ast.Store)})
+
+    def path(self, name):
+        return self.root / f"{self.keys[name]}.pkl"
+
+    def save(self, scene, name):
+        """Keep the state ``scene`` is in at the start of section ``name``, unless already kept."""
+        path = self.path(name)
+        if path.exists():
+            return
+        state = {"mobjects": scene.mobjects, "foreground": scene.foreground_mobjects,
+                 "attributes": {a: getattr(scene, a) for a in self.attributes if hasattr(scene, a)}}
+        try:
+            # One dump, so a mobject both on screen and in an attribute stays one object
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Cannot checkpoint the scene before {name}: {e}")
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def restore(self, scene, name):
+        """Put ``scene`` in the state at the start of section ``name``; False if there is no checkpoint."""
+        path = self.path(name)
+        if not path.exists():
+            return False
+        try:
+            state = pickle.loads(path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return False
+        scene.mobjects = state["mobjects"]
+        scene.foreground_mobjects = state["foreground"]
+        for attribute, value in state["attributes"].items():
+            setattr(scene, attribute, value)
+        return True
@@ -0,0 +1,127 @@
+"""Rendering a deck as a Slurm array job.
+
+``submit`` writes a manifest listing one work item per section that is not
+in the shared store yet, and a batch script whose array task N renders item
+N and stores its slides in the store under the section's content key (see
+render_cache.py). A gather job, started once every task succeeded, restores
+all sections from the store into slides/ and stitches the deck.
+
+The store is a render cache directory on a filesystem all nodes see, so
+items rendered by earlier submissions, other users or a laptop are reused,
+and tasks never write the same entry. Every submission gets its own
+directory ``.slurm/<timestamp>/`` for the manifest, scripts and logs, so
+submitting again while an earlier job is queued leaves that job's manifest
+alone.
+
+The ``local`` backend is a fake scheduler: it runs the same batch script
+for every array index with the Slurm variables set, a few at a time, and
+then the gather step, so the whole path runs without a cluster.
+"""
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+JOB_DIR = Path(".slurm")
+
+BATCH_SCRIPT = """#!/bin/bash
+#SBATCH --job-name={name}
+#SBATCH --array=0-{last}%{parallel}
+#SBATCH --output={logs}/%x-%A_%a.out
+{options}
+set -e
+cd {workdir}
+{launcher}python build.py --file {file} --scene {scene} work {manifest} "$SLURM_ARRAY_TASK_ID"
+"""
+
+GATHER_SCRIPT = """#!/bin/bash
+#SBATCH --job-name={name}-gather
+#SBATCH --output={logs}/%x-%j.out
+{options}
+set -e
+cd {workdir}
+{launcher}python build.py --file {file} --scene {scene} gather {manifest}
+"""
+
+
+def submission_dir(root=JOB_DIR):
+    """A new directory for one submission's manifest, scripts and logs."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    for n in range(1000):
+        path = Path(root) / (stamp if n == 0 else f"{stamp}-{n}")
+        try:
+            path.mkdir(parents=True)
+            return path
+        except FileExistsError:
+            continue
+    raise SystemExit(f"Cannot make a submission directory under {root}")
+
+
+def write_manifest(path, args, items, store):
+    manifest = {
+        "quality": args.quality,
+        "renderer": args.renderer,
+        "store": str(Path(store).resolve()),
+        "items": [{"section": name, "key": key} for name, key in items],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def read_manifest(path):
+    return json.loads(Path(path).read_text())
+
+
+def write_scripts(args, manifest_file, count):
+    """The array and gather batch scripts for a manifest of ``count`` items, next to it."""
+    job_dir = manifest_file.parent
+    options = "\n".join(f"#SBATCH {o}" for o in args.sbatch)
+    fields = dict(name=f"{args.scene}-render", last=max(count - 1, 0), parallel=args.max_parallel,
+                  logs=(job_dir / "logs").resolve(), options=options, workdir=shlex.quote(str(Path.cwd())),
+                  launcher=f"{args.launcher} " if args.launcher else "", file=shlex.quote(args.file), scene=args.scene,
+                  manifest=shlex.quote(str(manifest_file.resolve())))
+    (job_dir / "logs").mkdir(parents=True, exist_ok=True)
+    array, gather = job_dir / "render.sbatch", job_dir / "gather.sbatch"
+    array.write_text(BATCH_SCRIPT.format(**fields))
+    gather.write_text(GATHER_SCRIPT.format(**fields))
+    return array, gather
+
+
+def submit_slurm(array, gather, count):
+    def sbatch(*args):
+        out = subprocess.run(["sbatch", "--parsable", *args], check=True, stdout=subprocess.PIPE, text=True)
+        return out.stdout.strip().split(";")[0]
+    if count == 0:
+        job = sbatch(str(gather))
+        print(f"Everything is in the store, submitted gather job {job}")
+        return
+    array_job = sbatch(str(array))
+    gather_job = sbatch(f"--dependency=afterok:{array_job}", str(gather))
+    print(f"Submitted array job {array_job} ({count} tasks) and gather job {gather_job}")
+
+
+def run_local(array, gather, count, jobs):
+    """Run the batch scripts like Slurm would, without Slurm."""
+    def task(index):
+        env = {**os.environ, "SLURM_ARRAY_JOB_ID": "local", "SLURM_ARRAY_TASK_ID": str(index),
+               "SLURM_ARRAY_TASK_COUNT": str(count)}
+        log = array.parent / "logs" / f"local_{index}.out"
+        with open(log, "w") as out:
+            code = subprocess.run(["bash", str(array)], env=env, stdout=out, stderr=subprocess.STDOUT).returncode
+        return index, code, log
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for index, code, log in pool.map(task, range(count)):
+            print(f"  task {index:3d} {'ok' if code == 0 else 'FAILED'}  {log}")
+            if code != 0:
+                failed.append(index)
+    if failed:
+        # afterok: the gather job never starts
+        raise SystemExit(f"Array tasks failed: {', '.join(map(str, failed))}")
+    subprocess.run(["bash", str(gather)], check=True, stdout=sys.stdout, stderr=sys.stderr)
@@ -0,0 +1,75 @@
+"""Leaving invisible mobjects out of every frame.
+
+Decks keep mobjects around that can no longer be seen: the source of a
+``Transform`` that was replaced, objects faded out to zero opacity, things
+moved off the frame. They stay in ``scene.mobjects`` until the next
+``keep_only_objects`` and the Cairo camera would rasterize each of them on
+every frame. ``CullingCamera`` drops them from the display list instead,
+so they stay in the scene and can still be animated back in.
+
+A family member is culled when all its fill and stroke opacities are zero
+(all alpha for images) or the bounding box of its own points, widened by
+its stroke, misses the frame. Culling is per frame and per member, so a
+group half on screen still draws the visible half.
+
+``Census`` counts the live mobjects at every ``next_slide`` and warns when
+the count has grown ``GROWTH_SLIDES`` slides in a row, with how many of
+them are culled: objects that were never removed from the scene.
+"""
+import numpy as np
+from manim import Camera, ImageMobject, VMobject, logger
+
+# Slides of uninterrupted growth in the live mobject count before warning
+GROWTH_SLIDES = 4
+
+
+def is_visible(mobject, camera):
+    """Whether a family member's own points can put any pixel into the frame."""
+    margin = 0
+    if isinstance(mobject, VMobject):
+        strokes = [(mobject.get_stroke_width(background), mobject.get_stroke_opacities(background))
+                   for background in (False, True)]
+        if not (np.any(mobject.get_fill_opacities() > 0)
+                or any(width > 0 and np.any(opacities > 0) for width, opacities in strokes)):
+            return False
+        # Cairo strokes are width * 0.01 units wide, centered on the path
+        margin = max(width for width, _ in strokes) * camera.cairo_line_width_multiple
+    elif isinstance(mobject, ImageMobject):
+        pixels = mobject.pixel_array
+        if pixels.shape[-1] == 4 and not pixels[..., 3].any():
+            return False
+    points = mobject.points[:, :2]
+    half = np.array([camera.frame_width, camera.frame_height]) / 2 + margin
+    center = np.asarray(camera.frame_center)[:2]
+    return bool(np.all(points.max(axis=0) >= center - half) and np.all(points.min(axis=0) <= center + half))
+
+
+class CullingCamera(Camera):
+    """Cairo camera that skips mobjects with nothing to draw in the frame."""
+
+    culled = 0
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = super().get_mobjects_to_display(*args, **kwargs)
+        visible = [m for m in mobjects if is_visible(m, self)]
+        self.culled = len(mobjects) - len(visible)
+        return visible
+
+
+class Census:
+    """Live mobject counts per slide, warning about steady growth."""
+
+    def __init__(self):
+        self.counts = []
+
+    def slide(self, section, mobjects, camera=None):
+        family = [m for mob in mobjects for m in mob.get_family() if len(m.points)]
+        self.counts.append(len(family))
+        recent = self.counts[-GROWTH_SLIDES - 1:]
+        if len(recent) > GROWTH_SLIDES and all(a < b for a, b in zip(recent, recent[1:])):
+            # Only the Cairo camera culls, under OpenGL the count has to do
+            hidden = "" if camera is None else \
+                f", {sum(not is_visible(m, camera) for m in family)} of them invisible or off-screen"
+            logger.warning(f"{section}: live mobjects grew on {GROWTH_SLIDES} slides in a row, "
+                           f"{recent[0]} -> {recent[-1]}{hidden}; "
+                           "remove what is no longer shown (keep_only_objects)")
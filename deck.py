@@ -0,0 +1,157 @@
+"""Shared slide-deck machinery: numbered sections that render independently.
+
+A deck lists its section methods in ``SECTIONS``; ``construct`` runs them in
+order. Sections outside ``render_sections`` still run (later sections depend
+on the state they build) but their animations are skipped and left out of
+the slides, so a one-section scene renders just that section's videos.
+
+Setting ``DECK_PROFILE=<dir>`` records per-slide timings there, see
+profile_deck.py, and ``DECK_ESTIMATE=<file>`` records what rendering would
+take, see estimate.py. Setting ``DECK_DRAFT=<dir>`` skips every animation and instead saves a PNG
+of each slide's final frame of the selected sections to that directory.
+
+A section scene starts from the checkpoint of the scene state nearest
+before its section instead of replaying every earlier section, and stops
+after its last section, see checkpoint.py.
+
+Under Cairo, mobjects that are invisible or off the frame are left out of
+every frame and steady growth of the scene is reported, see culling.py,
+and partial movies are encoded in the background, see pipeline.py.
+"""
+import os
+from pathlib import Path
+
+from manim import RendererType, Scene, config
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim_slides import Slide
+from PIL import Image
+
+import checkpoint
+import estimate
+import pipeline
+import profile_deck
+from culling import Census, CullingCamera
+
+
+def register_section_scenes(deck, namespace):
+    """Add one ``<Deck>_<section>`` scene per section to a module namespace."""
+    for name in deck.SECTIONS:
+        scene_name = f"{deck.__name__}_{name}"
+        namespace[scene_name] = type(scene_name, (deck,), {
+            "render_sections": (name,),
+            "__module__": deck.__module__,
+        })
+
+
+class Deck(Slide):
+
+    SECTIONS = ()
+    # None renders every section
+    render_sections = None
+    draft_dir = os.environ.get("DECK_DRAFT")
+    skipping = False
+
+    def __init__(self, *args, **kwargs):
+        if config.renderer == RendererType.CAIRO:
+            kwargs.setdefault("camera_class", CullingCamera)
+            if pipeline.ENCODERS > 0:
+                kwargs.setdefault("renderer", CairoRenderer(file_writer_class=pipeline.PipelinedWriter,
+                                                            camera_class=kwargs["camera_class"],
+                                                            skip_animations=kwargs.get("skip_animations", False)))
+        super().__init__(*args, **kwargs)
+        self.census = Census()
+
+    @property
+    def deck_class(self):
+        """The class listing the sections, not one of its per-section scenes."""
+        return next(cls for cls in type(self).__mro__ if "SECTIONS" in vars(cls))
+
+    @property
+    def rendering(self):
+        """False in the modes that skip all animation and write no videos."""
+        return self.draft_dir is None and estimate.ESTIMATE_FILE is None
+
+    def construct(self):
+        if profile_deck.PROFILE_DIR is not None:
+            profile_deck.active = profile_deck.Profiler(type(self).__name__)
+        if estimate.ESTIMATE_FILE is not None:
+            estimate.active = estimate.Plan()
+        self.drafted = True
+        sections = list(self.SECTIONS)
+        checkpoints = checkpoint.Checkpoints(self.deck_class) if checkpoint.CHECKPOINT_DIR else None
+        if self.render_sections is not None:
+            # Later sections cannot change what the selected ones show
+            sections = sections[:max(sections.index(n) for n in self.render_sections) + 1]
+            first = min(sections.index(n) for n in self.render_sections)
+            if checkpoints is not None:
+                start = next((n for n in reversed(sections[1:first + 1]) if checkpoints.restore(self, n)), None)
+                if start is not None:
+                    sections = sections[sections.index(start):]
+        for name in sections:
+            if checkpoints is not None and name != self.SECTIONS[0]:
+                checkpoints.save(self, name)
+            self.section, self.slide_number = name, 0
+            if profile_deck.active is not None:
+                profile_deck.active.section = name
+            self.selected = self.render_sections is None or name in self.render_sections
+            self.skipping = not self.selected or not self.rendering
+            Scene.next_section(self, name, skip_animations=self.skipping)
+            getattr(self, name)()
+            self.next_slide()
+        self.skipping = False
+        if profile_deck.active is not None:
+            profile_deck.active.save()
+        if estimate.active is not None:
+            estimate.active.save()
+
+    def play(self, *args, **kwargs):
+        self.drafted = False
+        start = self.renderer.time
+        if self.skipping:
+            # Skipped animations produce no partial movie, so they must not
+            # count towards manim-slides' animation indices either
+            Scene.play(self, *args, **kwargs)
+        else:
+            super().play(*args, **kwargs)
+        if profile_deck.active is not None:
+            # Skipped plays and plays served from manim's cache advance the renderer
+            # clock too, but leave skip_animations set and write no frames
+            written = not self.renderer.skip_animations
+            profile_deck.active.play(round((self.renderer.time - start) * config.frame_rate) if written else 0)
+        if estimate.active is not None and self.selected:
+            estimate.active.play(self.duration, self.mobjects)
+
+    def next_slide(self, *args, **kwargs):
+        if self.draft_dir is not None and self.selected and not self.drafted:
+            self.save_draft()
+        if profile_deck.active is not None:
+            profile_deck.active.slide(self.section, self.mobjects)
+        if estimate.active is not None and self.selected:
+            estimate.active.slide(self.section)
+        if self.selected:
+            camera = self.renderer.camera
+            self.census.slide(self.section, self.mobjects, camera if isinstance(camera, CullingCamera) else None)
+        if self.skipping:
+            Scene.next_section(self, skip_animations=True)
+        else:
+            super().next_slide(*args, **kwargs)
+
+    def save_draft(self):
+        """Write the current frame as <draft_dir>/<Deck>_<section>_<slide>.png."""
+        self.slide_number += 1
+        self.drafted = True
+        if isinstance(self.renderer, CairoRenderer):
+            # Drafts skip every animation, which Cairo would otherwise not draw
+            self.renderer.update_frame(self, ignore_skipping=True)
+        else:
+            # OpenGLRenderer.update_frame always draws and takes no such flag
+            self.renderer.update_frame(self)
+        # Both renderers hand out frames as RGBA arrays
+        path = Path(self.draft_dir) / f"{self.deck_class.__name__}_{self.section}_{self.slide_number:03d}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(self.renderer.get_frame()).save(path)
+
+    def _save_slides(self, *args, **kwargs):
+        # Drafts and estimates render no videos for manim-slides to collect
+        if self.rendering:
+            super()._save_slides(*args, **kwargs)
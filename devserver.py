@@ -0,0 +1,85 @@
+"""Local HTTP server for checking what the deck downloads.
+
+Open ``http://localhost:8000/index.html?trace`` and step through the deck;
+the lazy-preload and bundle players report each slide change to
+``/__slide/<n>``, so every asset request is logged against the slide that
+was showing. Range requests are answered with 206 like a static web server
+would, and logged with their range. A summary per slide is printed (and
+optionally written as JSON) on Ctrl-C.
+"""
+import json
+import os
+import re
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class TraceHandler(SimpleHTTPRequestHandler):
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/__slide/"):
+            self.server.slide = int(path.rsplit("/", 1)[1])
+            print(f"-- slide {self.server.slide}")
+            self.send_response(204)
+            self.end_headers()
+            return
+        requested = self.headers.get("Range")
+        self.server.requests.setdefault(self.server.slide, []).append(
+            path.lstrip("/") + (f" [{requested}]" if requested else ""))
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", requested or "")
+        if match is None:
+            super().do_GET()
+            return
+        file = self.translate_path(self.path)
+        if not os.path.isfile(file):
+            self.send_error(404)
+            return
+        size = os.path.getsize(file)
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start > end:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.end_headers()
+            return
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(file))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        with open(file, "rb") as f:
+            f.seek(start)
+            self.wfile.write(f.read(end - start + 1))
+
+    def log_message(self, format, *args):
+        print("   " + format % args)
+
+
+def make_server(port=8000, directory="."):
+    """A tracing server on ``port`` (0 picks a free one), not yet serving."""
+    server = ThreadingHTTPServer(("localhost", port), partial(TraceHandler, directory=directory))
+    server.slide, server.requests = 0, {}
+    return server
+
+
+def serve(port=8000, directory=".", log_file=None):
+    server = make_server(port, directory)
+    print(f"Serving {directory} on http://localhost:{server.server_address[1]}/index.html?trace")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("Requests per slide:")
+    for slide in sorted(server.requests):
+        assets = [r for r in server.requests[slide] if ".mp4" in r]
+        print(f"  slide {slide:3d}: {len(assets)} video requests, {len(server.requests[slide])} requests")
+        for asset in assets:
+            print(f"      {asset}")
+    if log_file:
+        with open(log_file, "w") as f:
+            json.dump(server.requests, f, indent=2)
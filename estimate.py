@@ -0,0 +1,125 @@
+"""Render time and disk use of a deck, predicted before rendering it.
+
+With ``DECK_ESTIMATE=<file>`` set, a deck runs ``construct()`` with every
+animation skipped and records per slide the run time of each play and the
+mobjects and points on screen while it runs. Nothing is rasterized, so this
+takes about as long as building the mobjects.
+
+A calibration, measured by profiling a real render on this machine, gives
+the cost of a frame: ``seconds = frames * (per_frame + per_point * points)``
+plus a fixed cost per play (one partial movie each), and the bytes written
+per frame. Predictions for another quality scale frame counts by its frame
+rate and per-frame costs by its pixel count, so they are rough unless the
+calibration was taken at the target quality.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+ESTIMATE_FILE = os.environ.get("DECK_ESTIMATE")
+# manim's -q flags: width, height, frame rate
+QUALITIES = {
+    "l": (854, 480, 15),
+    "m": (1280, 720, 30),
+    "h": (1920, 1080, 60),
+    "p": (2560, 1440, 60),
+    "k": (3840, 2160, 60),
+}
+# The deck refers to ./images and ./data
+ASSET_DIRS = ("images", "data")
+
+
+class Plan:
+
+    def __init__(self):
+        self.slides = []
+        self.plays = []
+
+    def play(self, run_time, mobjects):
+        family = [m for mob in mobjects for m in mob.get_family()]
+        self.plays.append({"run_time": run_time, "mobjects": len(family),
+                           "points": sum(len(m.points) for m in family)})
+
+    def slide(self, section):
+        self.slides.append({"section": section, "plays": self.plays})
+        self.plays = []
+
+    def save(self):
+        path = Path(ESTIMATE_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"slides": self.slides}, indent=2))
+
+
+# The plan being recorded, one scene per manim process
+active = None
+
+
+def workdir(path):
+    """A scratch directory for calibration renders, seeing the deck's assets."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name in ASSET_DIRS:
+        link = path / name
+        if not link.exists() and Path(name).exists():
+            link.symlink_to(Path(name).resolve())
+    return path
+
+
+def calibrate(report, slide_bytes, quality):
+    """Fit frame costs to a profile report and the bytes of the clips its slides produced."""
+    slides = [s for s in report["slides"] if s["frames"] > 0]
+    if len(slides) < 3:
+        raise SystemExit("Calibration needs at least three rendered slides")
+    frames = np.array([s["frames"] for s in slides], dtype=float)
+    points = np.array([s["points"] for s in slides], dtype=float)
+    plays = np.array([s["plays"] for s in slides], dtype=float)
+    seconds = np.array([s["seconds"] for s in slides])
+    design = np.column_stack([frames, frames * points, plays])
+    coef, *_ = np.linalg.lstsq(design, seconds, rcond=None)
+    per_frame, per_point, per_play = np.clip(coef, 0, None)
+    return {
+        "quality": quality,
+        "per_frame": float(per_frame),
+        "per_point": float(per_point),
+        "per_play": float(per_play),
+        "bytes_per_frame": float(sum(slide_bytes) / frames.sum()),
+        "slides": len(slides),
+    }
+
+
+def predict(plan, calibration, quality):
+    """Frames, seconds and bytes per slide of a plan rendered at ``quality``."""
+    width, height, fps = QUALITIES[quality]
+    cw, ch, _ = QUALITIES[calibration["quality"]]
+    scale = width * height / (cw * ch)
+    predictions = []
+    # next_slide right after next_slide makes no slide
+    for slide in (s for s in plan["slides"] if s["plays"]):
+        frames = seconds = 0
+        for p in slide["plays"]:
+            n = round(p["run_time"] * fps)
+            frames += n
+            seconds += n * (calibration["per_frame"] + calibration["per_point"] * p["points"]) * scale
+            seconds += calibration["per_play"]
+        predictions.append({"section": slide["section"], "plays": len(slide["plays"]), "frames": frames,
+                            "seconds": seconds, "bytes": frames * calibration["bytes_per_frame"] * scale})
+    return predictions
+
+
+def report(predictions, quality, jobs=1):
+    print(f"{'slide':>5} {'section':<8}{'plays':>6}{'frames':>8}{'seconds':>10}{'MiB':>9}")
+    for i, p in enumerate(predictions, 1):
+        print(f"{i:>5} {p['section']:<8}{p['plays']:>6}{p['frames']:>8}{p['seconds']:>10.1f}{p['bytes']/2**20:>9.1f}")
+    sections = {}
+    for p in predictions:
+        sections[p["section"]] = sections.get(p["section"], 0) + p["seconds"]
+    frames = sum(p["frames"] for p in predictions)
+    seconds = sum(p["seconds"] for p in predictions)
+    size = sum(p["bytes"] for p in predictions)
+    # Sections render in parallel, so the slowest one bounds the wall time
+    wall = max(seconds / max(jobs, 1), max(sections.values(), default=0))
+    print(f"\n-q{quality}: {len(predictions)} slides, {sum(p['plays'] for p in predictions)} partial movies, "
+          f"{frames} frames, {size/2**30:.2f} GiB")
+    print(f"Render time {seconds/60:.1f} min of work, about {wall/60:.1f} min with {jobs} workers")
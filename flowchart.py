@@ -0,0 +1,87 @@
+"""Boxed-node diagrams laid out in one vectorized pass.
+
+    chart = FlowChart({
+        "code": dict(label="Write Code", color=MAIN_COLOR, to_edge=LEFT+UP, shift=0.5*RIGHT),
+        "build": dict(label="Build", color=MAIN_COLOR, next_to=("code", 5*RIGHT)),
+    }, [
+        ("code", "build", RIGHT, LEFT),
+    ], buff=BOX_BUFF)
+    self.play(chart.reveal("build", ("code", "build")))
+
+Placement follows manim's ``next_to``/``to_edge``/``shift`` semantics, but
+all box sizes, centers and connector endpoints are computed as NumPy arrays
+(nodes resolved level by level through their ``next_to`` references) before
+any box or arrow is built. Edges are ``(src, dst, src_side, dst_side[, opts])``
+where sides pick a critical point of the node box (``RIGHT``, ``DL``, ...) and
+opts may set ``color``, ``angle`` (curved arrow) and ``shift`` of the start.
+"""
+import numpy as np
+from manim import (DEFAULT_MOBJECT_TO_EDGE_BUFFER, DEFAULT_MOBJECT_TO_MOBJECT_BUFFER, AnimationGroup,
+                   Arrow, Create, CurvedArrow, FadeIn, Rectangle, VGroup, config)
+
+from mobject_cache import cached_text
+
+
+class FlowChart:
+
+    def __init__(self, nodes, edges, buff=0.3, fill_opacity=0.3, arrow_buff=0.1):
+        self.keys = list(nodes)
+        index = {k: i for i, k in enumerate(self.keys)}
+        specs = [nodes[k] for k in self.keys]
+        labels = [cached_text(s["label"]) for s in specs]
+
+        # Node geometry: half extents of the boxes and their centers
+        half = np.array([[m.width, m.height, 0.0] for m in labels]) / 2 + [buff, buff, 0.0]
+        center = np.zeros_like(half)
+        ref = np.array([index[s["next_to"][0]] if "next_to" in s else -1 for s in specs])
+        direction = np.array([s["next_to"][1] if "next_to" in s else s.get("to_edge", np.zeros(3)) for s in specs], dtype=float)
+        shift = np.array([s.get("shift", np.zeros(3)) for s in specs], dtype=float)
+        depth = np.zeros(len(specs), dtype=int)
+        for i, r in enumerate(ref):
+            if r >= i:
+                raise ValueError(f"Node '{self.keys[i]}' is placed next to a later node '{self.keys[r]}'")
+            depth[i] = depth[r] + 1 if r >= 0 else 0
+        sign = np.sign(direction)
+        roots = depth == 0
+        frame = np.array([config.frame_x_radius, config.frame_y_radius, 0.0])
+        center[roots] = np.where(sign[roots] != 0,
+                                 sign[roots] * (frame - half[roots]) - DEFAULT_MOBJECT_TO_EDGE_BUFFER * direction[roots],
+                                 0.0) + shift[roots]
+        for level in range(1, depth.max(initial=0) + 1):
+            at, r = depth == level, ref[depth == level]
+            center[at] = np.where(sign[at] != 0,
+                                  center[r] + sign[at] * (half[r] + half[at]) + DEFAULT_MOBJECT_TO_MOBJECT_BUFFER * direction[at],
+                                  center[r]) + shift[at]
+
+        # Connector endpoints, all edges at once
+        edges = [e if len(e) == 5 else (*e, {}) for e in edges]
+        src = np.array([index[e[0]] for e in edges], dtype=int)
+        dst = np.array([index[e[1]] for e in edges], dtype=int)
+        start = center[src] + half[src] * np.array([e[2] for e in edges], dtype=float).reshape(-1, 3) \
+            + np.array([e[4].get("shift", np.zeros(3)) for e in edges], dtype=float).reshape(-1, 3)
+        end = center[dst] + half[dst] * np.array([e[3] for e in edges], dtype=float).reshape(-1, 3)
+
+        self.nodes = {}
+        for key, spec, label, c, h in zip(self.keys, specs, labels, center, half):
+            box = Rectangle(width=2*h[0], height=2*h[1], color=spec["color"], fill_opacity=fill_opacity)
+            self.nodes[key] = VGroup(label.move_to(c), box.move_to(c))
+        self.edges = {}
+        for (a, b, _, _, opts), s, e, d in zip(edges, start, end, dst):
+            color = opts.get("color", specs[d]["color"])
+            if "angle" in opts:
+                arrow = CurvedArrow(s, e, color=color, angle=opts["angle"])
+            else:
+                arrow = Arrow(s, e, color=color, buff=arrow_buff)
+            self.edges[a, b] = arrow
+
+    def node(self, key):
+        return self.nodes[key]
+
+    def edge(self, src, dst):
+        return self.edges[src, dst]
+
+    def reveal(self, *items):
+        """One animation creating the given edges ``(src, dst)`` and fading in the given nodes."""
+        anims = [Create(self.edges[i]) for i in items if isinstance(i, tuple)]
+        anims += [FadeIn(self.nodes[i]) for i in items if not isinstance(i, tuple)]
+        return AnimationGroup(*anims)
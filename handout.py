@@ -0,0 +1,62 @@
+"""Handouts from an already rendered deck, without running ``construct()``.
+
+Every slide ends on the last frame of its clip, so the handout is that
+frame per slide: taken from the converted <Scene>.html (its clips, or its
+stills for static slides) when there is one, otherwise from the section
+scenes' manim-slides JSON in ``slides/`` or their render cache entries.
+Frames are extracted by parallel ffmpeg processes into numbered PNGs, then
+bound into a single PDF.
+"""
+import json
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from postprocess import ffmpeg
+from render_cache import CACHE_DIR, SLIDES_DIR
+
+# data-deck-video is a background video after lazy_preload
+BACKGROUND_RE = re.compile(r'data-(?:background-video|background-image|deck-video)="([^"]+)"')
+
+
+def html_slides(html):
+    """The clip or still behind each slide of a converted deck, in order."""
+    html = Path(html)
+    return [html.parent / path for path in BACKGROUND_RE.findall(html.read_text())]
+
+
+def scene_slides(scene, key=None, slides_dir=SLIDES_DIR):
+    """The clip of each slide of one rendered scene, from slides/ or the render cache."""
+    config = Path(slides_dir) / f"{scene}.json"
+    files = Path(slides_dir) / "files" / scene
+    if not config.exists() and key is not None:
+        config, files = CACHE_DIR / key / f"{scene}.json", CACHE_DIR / key / "files"
+    if not config.exists():
+        raise SystemExit(f"No rendered slides for {scene}, render it first")
+    return [files / Path(s["file"]).name for s in json.loads(config.read_text())["slides"]]
+
+
+def last_frame(source, image):
+    if source.suffix == ".png":
+        shutil.copyfile(source, image)
+    else:
+        ffmpeg("-sseof", "-1", "-i", str(source), "-update", "1", str(image))
+    return image
+
+
+def export(sources, out_dir, pdf=None, jobs=None):
+    """Write ``out_dir/slide-NNN.png`` per source and bind them into ``pdf``."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old in out_dir.glob("slide-*.png"):
+        old.unlink()
+    images = [out_dir / f"slide-{i:03d}.png" for i in range(1, len(sources) + 1)]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(last_frame, sources, images))
+    if pdf is not None and images:
+        pages = [Image.open(i).convert("RGB") for i in images]
+        pages[0].save(pdf, save_all=True, append_images=pages[1:], resolution=96)
+    return images
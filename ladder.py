@@ -0,0 +1,145 @@
+"""Renditions of a converted deck's clips at several resolutions.
+
+``ladder`` transcodes every slide clip of one high-quality render, in a
+pool of ffmpeg workers, into each rung of a resolution ladder no taller
+than the render itself: ``<assets>/480p/<clip>`` and so on, the rung at the
+render's own height being the clip as it is. ``<assets>/renditions.json``
+lists, per slide, every rendition with its size, bytes and bitrate.
+
+The same manifest is inlined into the HTML with a script that runs before
+reveal.js reads the slide backgrounds. It points every slide video at one
+rendition: the smallest that covers the viewport in device pixels, capped
+by the download speed measured from earlier clip downloads (kept across
+visits) or reported by the browser. Once more clips have been measured the
+choice is revised for the slides that are not loaded yet.
+"""
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bundle import VIDEO_ATTR
+from postprocess import ffmpeg, probe
+
+HEIGHTS = (480, 1080, 2160)
+# Lower rungs are viewed smaller, so they can take a coarser quantizer
+CRF = {480: 30, 720: 28, 1080: 26, 1440: 24, 2160: 22}
+LADDER_MARKER = "<!-- deck: rendition ladder -->"
+LADDER_SCRIPT = """<script>
+      (function () {
+        var LADDER = %(manifest)s, KEY = "deck-bandwidth-kbps", HEADROOM = 1.5;
+        var heights = LADDER.heights, chosen = null;
+        function bandwidth() {
+          var stored = parseFloat(localStorage.getItem(KEY));
+          var reported = navigator.connection && navigator.connection.downlink * 1000;
+          return stored || reported || Infinity;
+        }
+        function measure() {
+          var bits = 0, ms = 0;
+          performance.getEntriesByType("resource").forEach(function (e) {
+            if (/\\.mp4$/.test(e.name) && e.transferSize > 0 && e.responseEnd > e.responseStart) {
+              bits += e.transferSize * 8;
+              ms += e.responseEnd - e.responseStart;
+            }
+          });
+          if (ms > 0) localStorage.setItem(KEY, bits / ms);
+        }
+        function choose() {
+          var dpr = window.devicePixelRatio || 1;
+          var need = Math.min(window.innerHeight, window.innerWidth * 9 / 16) * dpr;
+          var fit = heights.filter(function (h) { return h >= need; })[0] || heights[heights.length - 1];
+          var speed = bandwidth();
+          var affordable = heights.filter(function (h) { return h <= fit && LADDER.kbps[h] * HEADROOM <= speed; });
+          return affordable.length ? affordable[affordable.length - 1] : heights[0];
+        }
+        function apply(height, from) {
+          var slides = document.querySelectorAll(".reveal .slides > section");
+          for (var i = from; i < slides.length; i++) {
+            ["data-background-video", "data-deck-video"].forEach(function (attr) {
+              if (!slides[i].hasAttribute(attr)) return;
+              var clip = LADDER.clips[slides[i].getAttribute("data-ladder-source") || slides[i].getAttribute(attr)];
+              if (!clip) return;
+              slides[i].setAttribute("data-ladder-source", clip.source);
+              slides[i].setAttribute(attr, clip[height]);
+              if (from > 0 && window.Reveal && Reveal.isReady()) Reveal.syncSlide(slides[i]);
+            });
+          }
+          chosen = height;
+        }
+        apply(choose(), 0);
+        window.addEventListener("load", function () {
+          Reveal.on("slidechanged", function (e) {
+            measure();
+            var height = choose();
+            // Slides near the current one already hold their video
+            if (height !== chosen) apply(height, e.indexh + 3);
+          });
+        });
+      })();
+    </script>"""
+
+
+def transcode(video, out, height, codec):
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if not out.exists() or out.stat().st_mtime < video.stat().st_mtime:
+        ffmpeg("-i", str(video), "-vf", f"scale=-2:{height}:flags=lanczos", "-c:v", codec,
+               "-crf", str(CRF.get(height, 26)), "-preset", "slow", "-pix_fmt", "yuv420p",
+               "-movflags", "+faststart", "-an", str(out))
+    return out
+
+
+def ladder(html, heights=HEIGHTS, codec="libx264", jobs=None):
+    """Transcode the deck's clips into each rung, write the manifest and the player's selection."""
+    html = Path(html)
+    text = html.read_text()
+    if LADDER_MARKER in text:
+        raise SystemExit(f"{html} already selects from renditions")
+    root = html.parent
+    slides = re.findall(r"<section\b.*?</section>", text, re.S)
+    clips = [(i, m.group(1)) for i, s in enumerate(slides) for m in [re.search(VIDEO_ATTR, s)] if m]
+    if not clips:
+        raise SystemExit(f"{html} has no slide videos")
+    sources = list(dict.fromkeys(c for _, c in clips))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        probes = dict(zip(sources, pool.map(lambda c: probe(root / c), sources)))
+    top = min(h for _, h, _ in probes.values())
+    rungs = sorted({h for h in heights if h < top} | {top})
+    skipped = [h for h in heights if h > top]
+    if skipped:
+        print(f"Rendered at {top}p, no {', '.join(f'{h}p' for h in skipped)} rendition: render with -qk for 2160p")
+
+    def rendition(source, height):
+        clip = root / source
+        if height == top:
+            return source
+        return str(transcode(clip, clip.parent / f"{height}p" / clip.name, height, codec).relative_to(root))
+
+    jobs_list = [(s, h) for s in sources for h in rungs]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        files = dict(zip(jobs_list, pool.map(lambda job: rendition(*job), jobs_list)))
+
+    duration = sum(d for _, _, d in probes.values())
+    manifest = {"heights": rungs, "kbps": {}, "clips": {}, "slides": []}
+    for h in rungs:
+        size = sum((root / files[s, h]).stat().st_size for s in sources)
+        manifest["kbps"][h] = size * 8 / 1000 / duration if duration else 0
+    for source in sources:
+        manifest["clips"][source] = {"source": source, **{h: files[source, h] for h in rungs}}
+    for i, source in clips:
+        renditions = {}
+        for h in rungs:
+            file = root / files[source, h]
+            width = round(probes[source][0] * h / top / 2) * 2
+            renditions[h] = {"file": files[source, h], "width": width, "height": h, "bytes": file.stat().st_size,
+                             "kbps": file.stat().st_size * 8 / 1000 / probes[source][2] if probes[source][2] else 0}
+        manifest["slides"].append({"slide": i, "source": source, "renditions": renditions})
+    assets = (root / sources[0]).parent
+    (assets / "renditions.json").write_text(json.dumps(manifest, indent=2))
+
+    player = {"heights": rungs, "kbps": manifest["kbps"], "clips": manifest["clips"]}
+    script = LADDER_SCRIPT % {"manifest": json.dumps(player)}
+    # Must run before Reveal.initialize, which reads the slides' backgrounds
+    init = text.index("Reveal.initialize(")
+    at = text.rindex("<script", 0, init)
+    html.write_text(f"{text[:at]}{LADDER_MARKER}\n    {script}\n    {text[at:]}")
+    return manifest
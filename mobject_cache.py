@@ -0,0 +1,157 @@
+"""Memoized Text, Code, SVG and image mobjects.
+
+Building a ``Text`` goes through Pango layout and SVG parsing, a ``Code``
+adds a Pygments pass on top, and a deck builds many identical ones. The
+factories here build each distinct mobject once, keep it in a bounded
+in-memory LRU and pickle its geometry to ``.mobject-cache/`` so later runs
+skip the build too. Callers always get a copy of the cached prototype.
+
+Keys cover the positional and keyword arguments plus the class defaults
+set through ``set_default``, so changing the deck's font or sizes misses.
+File-based mobjects are keyed on the file's content hash; raster images
+are also downsampled to the pixels they cover at the active quality. The
+renderer is part of every key, since mobjects differ between renderers.
+"""
+import hashlib
+import math
+import os
+import pickle
+from collections import OrderedDict
+from functools import partialmethod
+from pathlib import Path
+
+import manim
+import numpy as np
+from manim import DEFAULT_QUALITY, QUALITIES, Code, ImageMobject, Paragraph, SVGMobject, Text, config
+from PIL import Image
+
+CACHE_DIR = Path(".mobject-cache")
+
+
+def class_defaults(cls):
+    """Keyword defaults installed on a mobject class by ``set_default``."""
+    init, defaults = cls.__dict__.get("__init__"), {}
+    while isinstance(init, partialmethod):
+        defaults = {**init.keywords, **defaults}
+        init = init.func
+    return defaults
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def mobject_key(cls, *args, **kwargs):
+    # Paragraph and Code lay their lines out as Text, so Text defaults matter too
+    spec = (manim.__version__, str(config.renderer), cls.__name__, args, sorted(kwargs.items()),
+            sorted(class_defaults(cls).items()), sorted(class_defaults(Text).items()))
+    return hashlib.sha256(repr(spec).encode()).hexdigest()
+
+
+class MobjectCache:
+    """Prototype mobjects by key, in memory and pickled on disk."""
+
+    def __init__(self, root=CACHE_DIR, max_memory=512, max_files=4096):
+        self.root = Path(root)
+        self.max_memory = max_memory
+        self.max_files = max_files
+        self.memory = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key, build):
+        mob = self.memory.get(key)
+        if mob is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return mob.copy()
+        mob = self._load(key)
+        if mob is None:
+            self.misses += 1
+            mob = build()
+            self._dump(key, mob)
+        else:
+            self.hits += 1
+        self.memory[key] = mob
+        if len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+        return mob.copy()
+
+    def _load(self, key):
+        path = self.root / f"{key}.pkl"
+        try:
+            with open(path, "rb") as f:
+                mob = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        # mtime is the LRU clock for the on-disk entries
+        os.utime(path)
+        return mob
+
+    def _dump(self, key, mob):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f"{key}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(mob, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic, sections render in parallel processes
+            os.replace(tmp, self.root / f"{key}.pkl")
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            tmp.unlink(missing_ok=True)
+            return
+        self._trim()
+
+    def _trim(self):
+        files = list(self.root.glob("*.pkl"))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda f: f.stat().st_mtime)
+        for f in files[:len(files) - self.max_files]:
+            f.unlink(missing_ok=True)
+
+
+cache = MobjectCache()
+
+
+def cached_text(text, **kwargs):
+    """Same as ``Text(text, **kwargs)``, built at most once."""
+    return cache.get(mobject_key(Text, text, **kwargs), lambda: Text(text, **kwargs))
+
+
+def cached_code(code, **kwargs):
+    """Same as ``Code(code=code, **kwargs)``, highlighted at most once."""
+    return cache.get(mobject_key(Code, code, **kwargs), lambda: Code(code=code, **kwargs))
+
+
+def cached_paragraph(*lines, **kwargs):
+    """Same as ``Paragraph(*lines, **kwargs)``, laid out at most once."""
+    return cache.get(mobject_key(Paragraph, *lines, **kwargs), lambda: Paragraph(*lines, **kwargs))
+
+
+def cached_svg(path, **kwargs):
+    """Same as ``SVGMobject(path, **kwargs)``, parsed at most once per file content."""
+    key = mobject_key(SVGMobject, file_digest(path), **kwargs)
+    return cache.get(key, lambda: SVGMobject(path, **kwargs))
+
+
+def cached_image(path, max_scale=1.0):
+    """Same as ``ImageMobject(path)``, with the bitmap cut down to what the frame shows.
+
+    ``max_scale`` is the largest ``.scale()`` the image is displayed at; the
+    pixels are resampled to the size that covers at the active quality, so
+    decoding and per-frame compositing work on a smaller array.
+    """
+    key = mobject_key(ImageMobject, file_digest(path), max_scale, config.pixel_height)
+
+    def build():
+        with Image.open(path) as im:
+            im = im.convert("RGBA")
+            # ImageMobject sizes images for 1080p whatever quality is rendered
+            reference = QUALITIES[DEFAULT_QUALITY]["pixel_height"]
+            height = config.frame_height * im.height / reference
+            rows = math.ceil(im.height * max_scale * config.pixel_height / reference)
+            if rows < im.height:
+                im = im.resize((max(1, round(im.width * rows / im.height)), rows), Image.LANCZOS)
+            return ImageMobject(np.array(im)).set_height(height)
+
+    return cache.get(key, build)
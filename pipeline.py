@@ -0,0 +1,135 @@
+"""Partial movies encoded in the background while the next play rasterizes.
+
+manim 0.18 pipes every frame of a play into an ffmpeg process as
+``frame.tobytes()`` and, at the end of the play, waits for ffmpeg to
+finish the file: Cairo sits idle while x264 flushes its lookahead, and a
+full pipe stalls Cairo whenever ffmpeg falls behind. ``PipelinedWriter``
+instead hands each frame, the fresh array ``CairoRenderer.get_frame``
+returns for every frame, by reference to a feeder thread that writes its
+buffer straight into the stdin of an ffmpeg process. Ending a play returns
+at once, so the next play rasterizes while a bounded pool of
+``DECK_ENCODERS`` ffmpeg processes encodes the previous ones; the scene
+only waits for them before combining the partial movies.
+
+Frames in flight share a budget of ``DECK_FRAME_BUFFER_MB``: when encoding
+falls behind, rasterization blocks instead of memory growing. Encoders
+write to a temporary name and rename on success, so two plays with the
+same hash never write the same file. ``DECK_ENCODERS=0``, OpenGL,
+transparent and non-MP4 output use manim's own writer.
+"""
+import os
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+from manim import RendererType, __version__, config, logger
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import write_to_movie
+
+ENCODERS = int(os.environ.get("DECK_ENCODERS", 2))
+FRAME_BUFFER_MB = int(os.environ.get("DECK_FRAME_BUFFER_MB", 512))
+
+
+class Encode(threading.Thread):
+    """One partial movie: frames from a queue into an ffmpeg process."""
+
+    def __init__(self, command, path, slots, budget):
+        super().__init__(daemon=True)
+        self.command, self.path = command, Path(path)
+        self.slots, self.budget = slots, budget
+        self.frames = queue.SimpleQueue()
+        self.error = None
+
+    def run(self):
+        tmp = self.path.with_name(f"{self.path.stem}.{id(self):x}.part{self.path.suffix}")
+        with self.slots:
+            try:
+                proc = subprocess.Popen([*self.command, str(tmp)], stdin=subprocess.PIPE)
+            except OSError as e:
+                proc, self.error = None, f"cannot start ffmpeg for {self.path.name}: {e}"
+            # Every frame is taken off the queue, even after a failure, so the budget is given back
+            while (frame := self.frames.get()) is not None:
+                if proc is not None and self.error is None:
+                    try:
+                        proc.stdin.write(memoryview(frame).cast("B"))
+                    except BrokenPipeError:
+                        self.error = f"ffmpeg stopped reading frames for {self.path.name}"
+                self.budget.release()
+            if proc is None:
+                return
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            if proc.wait() != 0 and self.error is None:
+                self.error = f"ffmpeg exited with {proc.returncode} writing {self.path.name}"
+        if self.error is None:
+            os.replace(tmp, self.path)
+        else:
+            tmp.unlink(missing_ok=True)
+
+
+class PipelinedWriter(SceneFileWriter):
+    """Scene file writer that encodes partial movies in a background pool."""
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.slots = threading.Semaphore(max(ENCODERS, 1))
+        frame_bytes = config.pixel_width * config.pixel_height * 4
+        self.budget = threading.Semaphore(max(2, FRAME_BUFFER_MB * 2**20 // frame_bytes))
+        self.encodes = []
+        self.encode = None
+
+    @staticmethod
+    def pipelined():
+        return (ENCODERS > 0 and config.renderer == RendererType.CAIRO and not config.transparent
+                and config.movie_file_extension == ".mp4")
+
+    def open_movie_pipe(self, file_path=None):
+        if not self.pipelined():
+            return super().open_movie_pipe(file_path=file_path)
+        if file_path is None:
+            file_path = self.partial_movie_files[self.renderer.num_plays]
+        self.partial_movie_file_path = file_path
+        fps = config.frame_rate
+        # Same encoding as manim's writer, the partial movies are concatenated without re-encoding
+        command = [
+            config.ffmpeg_executable, "-y", "-f", "rawvideo",
+            "-s", f"{config.pixel_width}x{config.pixel_height}", "-pix_fmt", "rgba",
+            "-r", str(int(fps) if fps == int(fps) else fps), "-i", "-", "-an",
+            "-loglevel", config.ffmpeg_loglevel.lower(),
+            "-metadata", f"comment=Rendered with Manim Community v{__version__}",
+            "-vcodec", "libx264", "-pix_fmt", "yuv420p",
+        ]
+        self.encode = Encode(command, file_path, self.slots, self.budget)
+        self.encode.start()
+        self.encodes.append(self.encode)
+
+    def write_frame(self, frame_or_renderer):
+        if self.encode is None:
+            return super().write_frame(frame_or_renderer)
+        if write_to_movie():
+            self.budget.acquire()
+            self.encode.frames.put(frame_or_renderer)
+
+    def close_movie_pipe(self):
+        if self.encode is None:
+            return super().close_movie_pipe()
+        self.encode.frames.put(None)
+        self.encode = None
+        logger.info(f"Animation {self.renderer.num_plays} : Partial movie file encoding in %(path)s",
+                    {"path": f"'{self.partial_movie_file_path}'"})
+
+    def wait(self):
+        """Block until every queued partial movie is written."""
+        for encode in self.encodes:
+            encode.join()
+        failed = [e.error for e in self.encodes if e.error]
+        self.encodes = []
+        if failed:
+            raise RuntimeError("; ".join(failed))
+
+    def finish(self):
+        self.wait()
+        super().finish()
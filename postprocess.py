@@ -0,0 +1,279 @@
+"""Post-processing of a converted deck: <Scene>.html and its assets folder.
+
+``optimize`` folds clips that are byte-identical or decode to the same
+frames onto one copy, points the HTML at it, replaces clips without any visual change by a
+PNG of their frame and cuts the static tail off the others, then re-encodes the remaining clips in a pool of ffmpeg
+workers and reports what each clip now weighs.
+
+``lazy_preload`` makes the player fetch only a window of slide videos
+around the current slide, the next one first.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+VIDEO_RE = re.compile(r'data-background-video="([^"]+)"')
+PRELOAD_MARKER = "<!-- deck: lazy preload -->"
+# Videos are moved to data-deck-video so reveal.js only sees the ones in the window
+PRELOAD_SCRIPT = """<script>
+      (function () {
+        var AHEAD = %(ahead)d, BEHIND = 1;
+        var slides = Array.prototype.slice.call(document.querySelectorAll(".reveal .slides > section"));
+        var fetched = {};
+        function url(i) { return slides[i] && slides[i].getAttribute("data-deck-video"); }
+        function arm(i) {
+          var slide = slides[i];
+          if (!slide || !url(i) || slide.hasAttribute("data-background-video")) return false;
+          slide.setAttribute("data-background-video", url(i));
+          return true;
+        }
+        function prefetch(i, priority) {
+          var u = url(i);
+          if (!u || fetched[u]) return;
+          fetched[u] = true;
+          fetch(u, {priority: priority}).catch(function () { fetched[u] = false; });
+        }
+        function update(current, sync) {
+          for (var i = current - BEHIND; i <= current + AHEAD; i++) {
+            if (arm(i) && sync) Reveal.syncSlide(slides[i]);
+          }
+          // The next slide is what the presenter needs first
+          prefetch(current + 1, "high");
+          for (var j = current + 2; j <= current + AHEAD; j++) prefetch(j, "low");
+        }
+        var start = parseInt((location.hash.match(/^#\\/(\\d+)/) || [0, 0])[1], 10);
+        update(start, false);
+        Reveal.on("ready", function (e) { update(e.indexh, true); });
+        Reveal.on("slidechanged", function (e) {
+          update(e.indexh, true);
+          if (/[?&]trace\\b/.test(location.search)) fetch("__slide/" + e.indexh, {cache: "no-store"});
+        });
+      })();
+    </script>"""
+# Most slides end in a play whose last frames no longer change, eg. under a
+# rate function that flattens out. Tails shorter than this are not worth an encode.
+MIN_TAIL = 15
+MANIFEST = ".reencoded.json"
+
+
+def ffmpeg(*args, **kwargs):
+    if shutil.which("ffmpeg") is None:
+        raise SystemExit("ffmpeg is needed for post-processing the deck")
+    return subprocess.run(["ffmpeg", "-v", "error", "-y", *args], check=True, **kwargs)
+
+
+def referenced_videos(html):
+    """Video paths the deck references, in slide order and without repeats."""
+    return list(dict.fromkeys(VIDEO_RE.findall(Path(html).read_text())))
+
+
+def digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def frames_digest(path):
+    """Digest of a clip's decoded frames at full resolution, whatever the container holds."""
+    out = ffmpeg("-i", str(path), "-map", "0:v", "-f", "hash", "-hash", "sha256", "-",
+                 stdout=subprocess.PIPE, text=True).stdout
+    return out.strip().split("=", 1)[1]
+
+
+def probe(video):
+    """Width, height and duration in seconds of a clip, from ffmpeg's stream info."""
+    if shutil.which("ffmpeg") is None:
+        raise SystemExit("ffmpeg is needed for post-processing the deck")
+    info = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(video), "-frames:v", "1", "-f", "null", "-"],
+                          check=True, stderr=subprocess.PIPE, text=True).stderr
+    h, m, s = re.search(r"Duration: (\d+):(\d+):([\d.]+)", info).groups()
+    width, height = re.search(r"Video: .*?(\d{2,5})x(\d{2,5})", info).groups()
+    return int(width), int(height), int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def decoded_frames(path):
+    """A clip's frames at full resolution, one RGB array at a time."""
+    width, height, _ = probe(path)
+    size = width * height * 3
+    proc = subprocess.Popen(["ffmpeg", "-v", "error", "-i", str(path), "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+                            stdout=subprocess.PIPE)
+    try:
+        while len(data := proc.stdout.read(size)) == size:
+            yield np.frombuffer(data, dtype=np.uint8)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def static_tail(path, tolerance=2):
+    """(frames, index of the first frame of the unchanging tail) of a clip.
+
+    The tail is compared with the clip's last frame rather than frame to frame,
+    so a slow fade is never cut short; ``tolerance`` only covers encoder noise.
+    """
+    count, last = 0, None
+    for count, last in enumerate(decoded_frames(path), 1):
+        pass
+    if last is None:
+        return 0, 0
+    start = 0
+    for i, frame in enumerate(decoded_frames(path)):
+        if np.abs(frame.astype(np.int16) - last).max() > tolerance:
+            start = i + 1
+    return count, min(start, count - 1)
+
+
+def still(video):
+    """Save the last frame of a clip as a PNG next to it."""
+    image = video.with_suffix(".png")
+    ffmpeg("-sseof", "-1", "-i", str(video), "-update", "1", "-compression_level", "100", str(image))
+    return image
+
+
+def trim(video, frames, codec, crf):
+    """Cut a clip after its first ``frames`` frames, in place."""
+    tmp = video.with_suffix(".tmp.mp4")
+    ffmpeg("-i", str(video), "-frames:v", str(frames), "-c:v", codec, "-crf", str(crf), "-preset", "slow",
+           "-pix_fmt", "yuv420p", "-movflags", "+faststart", "-an", str(tmp))
+    os.replace(tmp, video)
+
+
+def timed_videos(html):
+    """Videos of slides that loop or advance on their own, where the clip's length matters."""
+    sections = re.findall(r"<section\b[^>]*>", Path(html).read_text())
+    return {v for s in sections if "-loop" in s or "data-autoslide" in s for v in VIDEO_RE.findall(s)}
+
+
+def replace_static(html, videos, jobs=None, codec="libx264", crf=28, manifest=None):
+    """Show clips without visual change as their frame and cut the unchanging tail off the others.
+
+    A trimmed clip ends on the first frame of its former tail, which the
+    player holds once the clip has played, so the slide looks the same.
+    Returns ({video: image}, {video: frames cut}).
+    """
+    root = Path(html).parent
+    timed = {root / v for v in timed_videos(html)}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        tails = dict(zip(videos, pool.map(static_tail, videos)))
+        static = [v for v, (count, start) in tails.items() if count > 0 and start == 0]
+        cut = {v: count - 1 - start for v, (count, start) in tails.items()
+               if start > 0 and count - 1 - start >= MIN_TAIL and v not in timed}
+        images = dict(zip(static, pool.map(still, static)))
+        list(pool.map(lambda v: trim(v, tails[v][1] + 1, codec, crf), cut))
+    if manifest is not None:
+        # Already encoded with the deck's settings, the re-encode pass can skip them
+        for video in cut:
+            manifest[video.name] = [f"{codec}:crf{crf}", digest(video)]
+    if images:
+        text = Path(html).read_text()
+        for video, image in images.items():
+            text = text.replace(f'data-background-video="{video.relative_to(root)}"',
+                                f'data-background-image="{image.relative_to(root)}"')
+        Path(html).write_text(text)
+        for video in images:
+            video.unlink()
+    return images, cut
+
+
+def find_duplicates(videos, jobs):
+    """Map each duplicate clip to the first clip it is identical to, in bytes or in every decoded pixel."""
+    canonical, by_digest = {}, {}
+    for video in videos:
+        d = digest(video)
+        if d in by_digest:
+            canonical[video] = by_digest[d]
+        else:
+            by_digest[d] = video
+    unique = list(by_digest.values())
+    # Any tolerance would fold slides that differ by a word or a section number
+    by_frames = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for video, d in zip(unique, pool.map(frames_digest, unique)):
+            if d in by_frames:
+                canonical[video] = by_frames[d]
+            else:
+                by_frames[d] = video
+    return canonical
+
+
+def lazy_preload(html, ahead=2):
+    """Limit the deck's video downloads to the current slide plus ``ahead`` slides."""
+    html = Path(html)
+    text = html.read_text()
+    if PRELOAD_MARKER in text:
+        return
+    text = text.replace("data-background-video=", "data-deck-video=")
+    text = re.sub(r"viewDistance: \d+", f"viewDistance: {ahead + 1}", text)
+    text = re.sub(r"mobileViewDistance: \d+", f"mobileViewDistance: {ahead + 1}", text)
+    # Must run before Reveal.initialize, which reads the slides' backgrounds
+    init = text.index("Reveal.initialize(")
+    script = text.rindex("<script", 0, init)
+    text = f"{text[:script]}{PRELOAD_MARKER}\n    {PRELOAD_SCRIPT % {'ahead': ahead}}\n    {text[script:]}"
+    html.write_text(text)
+
+
+def reencode(video, codec, crf, manifest):
+    """Re-encode one clip in place if that makes it smaller; returns (before, after) sizes."""
+    before = video.stat().st_size
+    settings = f"{codec}:crf{crf}"
+    if manifest.get(video.name) == [settings, digest(video)]:
+        return before, before
+    tmp = video.with_suffix(".tmp.mp4")
+    ffmpeg("-i", str(video), "-c:v", codec, "-crf", str(crf), "-preset", "slow",
+           "-pix_fmt", "yuv420p", "-movflags", "+faststart", "-an", str(tmp))
+    if tmp.stat().st_size < before:
+        os.replace(tmp, video)
+    else:
+        tmp.unlink()
+    manifest[video.name] = [settings, digest(video)]
+    return before, video.stat().st_size
+
+
+def optimize(html, codec="libx264", crf=28, jobs=None, reencode_clips=True, stills=True):
+    html = Path(html)
+    root = html.parent
+    videos = [root / v for v in referenced_videos(html)]
+    canonical = find_duplicates(videos, jobs)
+    dedup_bytes = 0
+    if canonical:
+        text = html.read_text()
+        for dup, keep in canonical.items():
+            text = text.replace(str(dup.relative_to(root)), str(keep.relative_to(root)))
+            dedup_bytes += dup.stat().st_size
+            dup.unlink()
+        html.write_text(text)
+    print(f"Deduplicated {len(canonical)} of {len(videos)} clips, {dedup_bytes/1024:.1f} KiB saved")
+    for dup, keep in canonical.items():
+        print(f"  {dup.name[:16]} -> {keep.name[:16]}")
+    survivors = [v for v in videos if v not in canonical]
+    video_bytes = {v: v.stat().st_size for v in survivors}
+    manifest_file = survivors[0].parent / MANIFEST if survivors else None
+    manifest = json.loads(manifest_file.read_text()) if manifest_file and manifest_file.exists() else {}
+    images, cut = replace_static(html, survivors, jobs, codec, crf, manifest) if stills else ({}, {})
+    print(f"Replaced {len(images)} static clips by stills")
+    for video, image in images.items():
+        print(f"  {video.name[:16]}  {video_bytes[video]/1024:8.1f} KiB -> {image.stat().st_size/1024:8.1f} KiB")
+    print(f"Cut the static tail off {len(cut)} clips")
+    for video, frames in cut.items():
+        print(f"  {video.name[:16]}  {frames:5d} frames  {video_bytes[video]/1024:8.1f} KiB -> "
+              f"{video.stat().st_size/1024:8.1f} KiB")
+    survivors = [v for v in survivors if v not in images]
+    if cut:
+        manifest_file.write_text(json.dumps(manifest, indent=2))
+    if not reencode_clips or not survivors:
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        sizes = list(pool.map(lambda v: reencode(v, codec, crf, manifest), survivors))
+    manifest_file.write_text(json.dumps(manifest, indent=2))
+    print(f"Re-encoded {len(survivors)} clips with {codec} at CRF {crf}")
+    for video, (before, after) in zip(survivors, sizes):
+        print(f"  {video.name[:16]}  {before/1024:8.1f} KiB -> {after/1024:8.1f} KiB")
+    before = sum(video_bytes[v] for v in survivors) + dedup_bytes + sum(video_bytes[v] for v in images)
+    after = sum(a for _, a in sizes) + sum(i.stat().st_size for i in images.values())
+    print(f"Total {before/2**20:.2f} MiB -> {after/2**20:.2f} MiB ({(1 - after/before)*100 if before else 0:.0f}% saved)")
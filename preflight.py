@@ -0,0 +1,115 @@
+"""Checks a deck's images, SVGs, data files, fonts and LaTeX before rendering.
+
+A missing image only fails the render when its section is reached, and
+a missing font does not fail it at all: Pango quietly substitutes another.
+``check`` reads the deck source statically, collecting every string literal
+that names an asset file and every ``font=`` argument, verifies them all
+concurrently and returns every problem found, with the source line.
+
+Tex, MathTex and the mobjects built on them, such as Axes with numbers,
+need ``latex`` and ``dvisvgm``. When the deck or a local module it imports
+uses one, both must be on the PATH.
+"""
+import ast
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from render_cache import local_modules
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
+ASSET_SUFFIXES = IMAGE_SUFFIXES | {".svg", ".csv"}
+# Mobjects that typeset with LaTeX, directly or through their labels and numbers
+TEX_MOBJECTS = {"Tex", "MathTex", "SingleStringMathTex", "Title", "BulletedList", "DecimalNumber",
+                "Integer", "Variable", "Matrix", "Axes", "ThreeDAxes", "NumberPlane"}
+TEX_TOOLS = ("latex", "dvisvgm")
+
+
+def references(file):
+    """(kind, value, line) of the assets and fonts a deck source refers to."""
+    tree = ast.parse(Path(file).read_text())
+    refs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and "\n" not in node.value:
+            if Path(node.value).suffix.lower() in ASSET_SUFFIXES:
+                refs.append(("file", node.value, node.lineno))
+        elif isinstance(node, ast.keyword) and node.arg == "font":
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                refs.append(("font", node.value.value, node.value.lineno))
+    return refs
+
+
+def tex_uses(file):
+    """(file, name, line) of the first LaTeX mobject used by the deck and each local module it imports."""
+    uses = []
+    for path in [Path(file), *local_modules(file)]:
+        nodes = list(ast.walk(ast.parse(path.read_text())))
+        # Tex.set_default(...) only configures Tex, the deck may never make one
+        defaults = {id(n.value) for n in nodes if isinstance(n, ast.Attribute) and n.attr == "set_default"}
+        names = [(node.lineno, node.id) for node in nodes
+                 if isinstance(node, ast.Name) and node.id in TEX_MOBJECTS and id(node) not in defaults]
+        if names:
+            line, name = min(names)
+            uses.append((path, name, line))
+    return uses
+
+
+def check_file(path):
+    """Why an asset file cannot be used, or None."""
+    path = Path(path)
+    if not path.is_file():
+        return "not found"
+    suffix = path.suffix.lower()
+    try:
+        if suffix in IMAGE_SUFFIXES:
+            with Image.open(path) as im:
+                im.verify()
+        elif suffix == ".svg":
+            ET.parse(path)
+        else:
+            with open(path, "rb") as f:
+                f.read(1)
+    except Exception as e:
+        return f"unreadable: {e}"
+    return None
+
+
+def installed_fonts():
+    """Font family names Pango can find, or None when there is no way to ask."""
+    try:
+        import manimpango
+        return {family.lower() for family in manimpango.list_fonts()}
+    except ImportError:
+        pass
+    if shutil.which("fc-list") is None:
+        return None
+    out = subprocess.run(["fc-list", ":", "family"], stdout=subprocess.PIPE, text=True).stdout
+    return {family.strip().lower() for line in out.splitlines() for family in line.split(",")}
+
+
+def check(file, base=None):
+    """Every problem with the deck's assets, fonts and LaTeX, as "file:line: message" strings."""
+    base = Path(base or Path(file).parent)
+    refs = references(file)
+    files = sorted({(v, line) for kind, v, line in refs if kind == "file"}, key=lambda r: r[1])
+    fonts = sorted({(v, line) for kind, v, line in refs if kind == "font"}, key=lambda r: r[1])
+    with ThreadPoolExecutor() as pool:
+        font_list = pool.submit(installed_fonts)
+        results = list(pool.map(lambda r: check_file(base / r[0]), files))
+        families = font_list.result()
+    problems = [f"{file}:{line}: {path}: {result}" for (path, line), result in zip(files, results) if result]
+    if families is None:
+        print(f"Warning: cannot check the fonts of {file}, neither manimpango nor fc-list is installed")
+    else:
+        problems += [f"{file}:{line}: font '{font}' is not installed, Pango would substitute another"
+                     for font, line in fonts if font.lower() not in families]
+    missing = [tool for tool in TEX_TOOLS if shutil.which(tool) is None]
+    if missing:
+        tools = f"{' and '.join(missing)} {'are' if len(missing) > 1 else 'is'}"
+        problems += [f"{path}:{line}: {name} typesets with LaTeX, but {tools} not installed"
+                     for path, name, line in tex_uses(file)]
+    return problems
@@ -1,8 +1,15 @@
 #!/usr/bin/bash
 #manim --disable_caching -qh -p bayesian.py
+# Sections render in parallel, eg. ./produce.sh --sections 2.0-2.5
+# re-renders only those and stitches them with the others into Apptainer.html
 set -e
 source .venv/bin/activate
-manim -qh -p apptainer.py
-manim-slides convert --to html -c progress=true -c controls=true -cslide_number=true "Apptainer" "Apptainer.html"
+python build.py render -qh "$@"
+python build.py optimize Apptainer.html
+# 480p/1080p renditions for the player to pick from; ./produce.sh -qk adds 2160p
+python build.py ladder Apptainer.html
 ./node_modules/html-inject-meta/cli.js < Apptainer.html  > index.html
+python build.py preload index.html --ahead 2
+# or play every slide from one fragmented MP4 instead of a clip per slide:
+#python build.py bundle index.html --ahead 2
 firefox index.html
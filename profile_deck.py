@@ -0,0 +1,155 @@
+"""Render profiling for decks: where does a render spend its time?
+
+With ``DECK_PROFILE=<dir>`` set, a deck records per slide the wall time up
+to its ``next_slide``, the plays and frames rendered, the mobjects and
+points on screen and the peak RSS, plus the time spent in helpers marked
+``@profiled``. Each scene writes ``<dir>/<Scene>.json``; ``merge`` folds the
+section scenes of a render into one report and ``summary``/``compare``
+print it, the latter against a baseline report.
+"""
+import json
+import os
+import resource
+import sys
+import time
+from functools import wraps
+from pathlib import Path
+
+PROFILE_DIR = os.environ.get("DECK_PROFILE")
+
+
+class Profiler:
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.section = None
+        self.slides = []
+        self.helpers = {}
+        self.start = self.mark = time.perf_counter()
+        self.plays = self.frames = 0
+
+    def play(self, frames):
+        self.plays += 1
+        self.frames += frames
+
+    def slide(self, section, mobjects):
+        now = time.perf_counter()
+        family = [m for mob in mobjects for m in mob.get_family()]
+        self.slides.append({
+            "section": section,
+            "seconds": now - self.mark,
+            "plays": self.plays,
+            "frames": self.frames,
+            "mobjects": len(family),
+            "points": sum(len(m.points) for m in family),
+            "peak_rss_mb": peak_rss_mb(),
+        })
+        self.mark, self.plays, self.frames = now, 0, 0
+
+    def helper(self, name, seconds):
+        helpers = self.helpers.setdefault(self.section, {})
+        calls, total = helpers.get(name, (0, 0.0))
+        helpers[name] = (calls + 1, total + seconds)
+
+    def report(self):
+        return {
+            "scene": self.scene,
+            "seconds": time.perf_counter() - self.start,
+            "peak_rss_mb": peak_rss_mb(),
+            "slides": self.slides,
+            "helpers": {section: {k: {"calls": c, "seconds": s} for k, (c, s) in helpers.items()}
+                        for section, helpers in self.helpers.items()},
+        }
+
+    def save(self):
+        path = Path(PROFILE_DIR) / f"{self.scene}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+
+
+# The profiler of the scene being rendered, one scene per manim process
+active = None
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def profiled(fn):
+    """Count calls and time of a deck helper while profiling; free otherwise."""
+    if PROFILE_DIR is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if active is not None:
+                active.helper(fn.__name__, time.perf_counter() - start)
+    return wrapper
+
+
+def merge(directory, scenes):
+    """One report from the per-scene reports of a sectioned render.
+
+    Section scenes still run the sections before theirs with animations
+    skipped, so only the slides of the section each scene renders count.
+    """
+    report = {"slides": [], "sections": {}, "helpers": {}, "seconds": 0.0, "peak_rss_mb": 0.0}
+    for section, scene in scenes.items():
+        data = json.loads((Path(directory) / f"{scene}.json").read_text())
+        slides = [s for s in data["slides"] if s["section"] == section]
+        report["slides"] += slides
+        report["sections"][section] = {
+            "seconds": sum(s["seconds"] for s in slides),
+            "process_seconds": data["seconds"],
+            "slides": len(slides),
+            "frames": sum(s["frames"] for s in slides),
+            "peak_rss_mb": data["peak_rss_mb"],
+        }
+        for name, h in data["helpers"].get(section, {}).items():
+            total = report["helpers"].setdefault(name, {"calls": 0, "seconds": 0.0})
+            total["calls"] += h["calls"]
+            total["seconds"] += h["seconds"]
+        report["seconds"] += data["seconds"]
+        report["peak_rss_mb"] = max(report["peak_rss_mb"], data["peak_rss_mb"])
+    return report
+
+
+def summary(report, top=10):
+    total = sum(s["seconds"] for s in report["sections"].values()) or 1.0
+    print(f"{'section':<10}{'slides':>7}{'frames':>8}{'seconds':>9}{'share':>7}{'process':>9}{'RSS MB':>8}")
+    for name, s in report["sections"].items():
+        print(f"{name:<10}{s['slides']:>7}{s['frames']:>8}{s['seconds']:>9.1f}{s['seconds']/total:>7.0%}"
+              f"{s['process_seconds']:>9.1f}{s['peak_rss_mb']:>8.0f}")
+    print("\nSlowest slides:")
+    numbered = [(i + 1, s) for i, s in enumerate(report["slides"])]
+    for n, s in sorted(numbered, key=lambda ns: -ns[1]["seconds"])[:top]:
+        print(f"  slide {n:3d} ({s['section']:<6}) {s['seconds']:7.2f}s {s['frames']:5d} frames "
+              f"{s['mobjects']:5d} mobjects {s['points']:8d} points")
+    if report["helpers"]:
+        print("\nHelpers:")
+        for name, h in sorted(report["helpers"].items(), key=lambda kv: -kv[1]["seconds"]):
+            print(f"  {name:<26} {h['calls']:5d} calls {h['seconds']:8.2f}s")
+
+
+def compare(baseline, report, threshold=0.1):
+    """Print per-section time changes; returns the sections that got slower than ``threshold``."""
+    slower = []
+    print(f"{'section':<10}{'before':>9}{'after':>9}{'change':>9}")
+    for name, s in report["sections"].items():
+        before = baseline["sections"].get(name)
+        if before is None:
+            print(f"{name:<10}{'-':>9}{s['seconds']:>9.1f}")
+            continue
+        change = s["seconds"] / before["seconds"] - 1 if before["seconds"] else 0.0
+        flag = ""
+        if change > threshold:
+            slower.append(name)
+            flag = "  slower"
+        print(f"{name:<10}{before['seconds']:>9.1f}{s['seconds']:>9.1f}{change:>+9.0%}{flag}")
+    return slower
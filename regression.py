@@ -0,0 +1,96 @@
+"""Visual regression checks on the final frames of a deck's slides.
+
+The frames come from a draft render (see deck.py), so no video is
+encoded: a low-resolution PNG per slide, sections in parallel. Each frame
+is reduced to a 64-bit perceptual hash (the signs of the lowest 8x8 DCT
+coefficients of a 32x32 grayscale thumbnail) and compared with the hash of
+the reference frame of the same slide. Slides whose hashes differ in more
+than ``tolerance`` bits are reported, which skips anti-aliasing and encoder
+noise but catches moved, resized or restyled content. Accepted changes are
+promoted with ``--update``.
+
+The reference hashes live in ``reference/hashes.json``, which is small and
+kept in the repository; the reference PNGs next to it are only local copies
+to look at when a slide differs. Drafting needs manim, Cairo and the deck's
+fonts, so ``python build.py regress --update`` is run on a machine that
+renders the deck, and tests/test_regression.py runs the check whenever the
+manifest is there and manim is installed.
+"""
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+REFERENCE_DIR = Path("reference")
+MANIFEST = "hashes.json"
+HASH_SIZE = 8
+THUMB_SIZE = 32
+
+
+def _dct_matrix(n):
+    k, i = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+DCT = _dct_matrix(THUMB_SIZE)
+
+
+def phash(path):
+    """Perceptual hash of an image as an integer of HASH_SIZE² bits."""
+    with Image.open(path) as im:
+        pixels = np.asarray(im.convert("L").resize((THUMB_SIZE, THUMB_SIZE), Image.LANCZOS), dtype=float)
+    low = (DCT @ pixels @ DCT.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    # The DC term only says how bright the frame is, compare against the median of the rest
+    bits = low > np.median(low[1:])
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def frames(directory, prefixes):
+    return {f.name: f for f in sorted(Path(directory).glob("*.png")) if f.name.startswith(prefixes)}
+
+
+def hashes(current, jobs=None):
+    """Perceptual hash of each frame, by slide."""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(zip(current, pool.map(phash, current.values())))
+
+
+def references(prefixes, root=REFERENCE_DIR):
+    """Reference hashes of the slides of some sections, empty without a manifest."""
+    manifest = Path(root) / MANIFEST
+    if not manifest.exists():
+        return {}
+    stored = json.loads(manifest.read_text())
+    return {name: int(h, 16) for name, h in stored.items() if name.startswith(prefixes)}
+
+
+def compare(current, references, tolerance=6, jobs=None):
+    """(slide, bits differing or None when one side is missing) for slides beyond tolerance."""
+    names = sorted(current.keys() | references.keys())
+    measured = hashes({n: current[n] for n in names if n in current and n in references}, jobs)
+    distances = {n: distance(h, references[n]) for n, h in measured.items()}
+    return [(n, distances.get(n)) for n in names if distances.get(n, tolerance + 1) > tolerance]
+
+
+def update(current, prefixes, root=REFERENCE_DIR, jobs=None):
+    """Make the current frames the references of their sections."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = root / MANIFEST
+    stored = json.loads(manifest.read_text()) if manifest.exists() else {}
+    stored = {name: h for name, h in stored.items() if not name.startswith(prefixes)}
+    stored.update({name: f"{h:016x}" for name, h in hashes(current, jobs).items()})
+    manifest.write_text(json.dumps(dict(sorted(stored.items())), indent=1) + "\n")
+    for old in frames(root, prefixes).values():
+        old.unlink()
+    for name, path in current.items():
+        shutil.copy2(path, root / name)
@@ -0,0 +1,236 @@
+"""Content-addressed cache of rendered deck sections.
+
+A section's key hashes everything its videos depend on, found by reading
+the deck source statically (no manim import, no mobjects built):
+
+- the section method and the previous section (whose heading the title
+  transforms from), plus any section assigning a ``self.`` attribute it reads;
+- deck methods and module-level functions it calls, recursively;
+- module globals it reads (``MAIN_COLOR``, ``small_size``, ``BOX_BUFF``, ...),
+  every ``*.set_default(...)`` call and ``config.<option> = ...`` assignment;
+- the bytes of files under ``images/`` and ``data/`` referenced by string literals;
+- every module next to the deck that it imports, directly or through another
+  such module (deck.py, flowchart.py, mobject_cache.py, charts.py, ...);
+- the manim quality flag, the renderer and the cache format version.
+
+Cached outputs are the section's manim-slides JSON and slide videos, kept
+under ``.render-cache/<key>/`` and restored into ``slides/`` on a hit.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(".render-cache")
+SLIDES_DIR = Path("slides")
+VERSION = 1
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def local_modules(file):
+    """Modules next to ``file`` that it imports, directly or through each other, in a stable order."""
+    root = Path(file).parent
+    seen, stack = {}, [Path(file)]
+    while stack:
+        tree = ast.parse(stack.pop().read_text())
+        names = [a.name for n in ast.walk(tree) if isinstance(n, ast.Import) for a in n.names]
+        names += [n.module for n in ast.walk(tree) if isinstance(n, ast.ImportFrom) and n.level == 0 and n.module]
+        for name in names:
+            top = name.split(".")[0]
+            for path in (root / f"{top}.py", root / top / "__init__.py"):
+                if path.exists() and path not in seen and path != Path(file):
+                    seen[path] = True
+                    stack.append(path)
+    return sorted(seen)
+
+
+class DeckSource:
+    """Static view of a deck file: globals, functions and deck methods."""
+
+    def __init__(self, file, scene):
+        self.file = Path(file)
+        self.text = self.file.read_text()
+        tree = ast.parse(self.text)
+        self.modules = local_modules(self.file)
+        self.globals = {}
+        self.functions = {}
+        self.methods = {}
+        self.defaults = []
+        for node in tree.body:
+            if isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for t in targets:
+                    if isinstance(t, ast.Name):
+                        self.globals[t.id] = node
+            elif isinstance(node, ast.FunctionDef):
+                self.functions[node.name] = node
+            elif isinstance(node, ast.ClassDef) and node.name == scene:
+                for stmt in node.body:
+                    if isinstance(stmt, ast.FunctionDef):
+                        self.methods[stmt.name] = stmt
+                    elif isinstance(stmt, ast.Assign) and any(getattr(t, "id", None) == "SECTIONS" for t in stmt.targets):
+                        self.sections = list(ast.literal_eval(stmt.value))
+            elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+                  and isinstance(node.value.func, ast.Attribute) and node.value.func.attr == "set_default"):
+                self.defaults.append(node)
+            if (isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Attribute)
+                    and getattr(node.targets[0].value, "id", None) == "config"):
+                self.defaults.append(node)
+
+    def source(self, node):
+        return ast.get_source_segment(self.text, node)
+
+    def attributes(self, node, ctx):
+        """Names of ``self.<attr>`` accessed with the given context in a node."""
+        return {n.attr for n in ast.walk(node)
+                if isinstance(n, ast.Attribute) and isinstance(n.ctx, ctx)
+                and isinstance(n.value, ast.Name) and n.value.id == "self"}
+
+    def dependencies(self, name):
+        """Source nodes a section's output depends on, in a stable order."""
+        index = self.sections.index(name)
+        roots = [self.methods[name]] + [self.methods[m] for m in ("setup",) if m in self.methods]
+        if index > 0:
+            roots.append(self.methods[self.sections[index-1]])
+        # Sections that last set the deck state this one reads
+        for attr in self.attributes(self.methods[name], ast.Load):
+            for previous in reversed(self.sections[:index]):
+                if attr in self.attributes(self.methods[previous], ast.Store):
+                    roots.append(self.methods[previous])
+                    break
+        seen, stack = {}, list(roots) + self.defaults
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen[id(node)] = node
+            for n in ast.walk(node):
+                if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load):
+                    stack += [d for d in (self.globals.get(n.id), self.functions.get(n.id)) if d is not None]
+                elif (isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name) and n.value.id == "self"
+                      and n.attr in self.methods and n.attr not in self.sections):
+                    stack.append(self.methods[n.attr])
+        return sorted(seen.values(), key=lambda n: n.lineno)
+
+    def assets(self, nodes):
+        """Files referenced by string literals under the given nodes."""
+        paths = set()
+        for node in nodes:
+            for n in ast.walk(node):
+                if isinstance(n, ast.Constant) and isinstance(n.value, str) and ("images/" in n.value or "data/" in n.value):
+                    paths.add(Path(n.value))
+        return sorted(paths)
+
+    def section_key(self, name, quality, renderer="cairo"):
+        nodes = self.dependencies(name)
+        h = hashlib.sha256(f"v{VERSION} -q{quality} --renderer={renderer} {name}\n".encode())
+        for node in nodes:
+            h.update(self.source(node).encode())
+        for path in self.assets(nodes):
+            h.update(f"{path}:{_file_digest(path) if path.exists() else 'missing'}\n".encode())
+        for module in self.modules:
+            h.update(f"{module.name}:{_file_digest(module)}\n".encode())
+        return h.hexdigest()
+
+
+class RenderCache:
+    """Section outputs stored by key, evicted least-recently-used first."""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=2 << 30):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.index_file = self.root / "index.json"
+        self.index = json.loads(self.index_file.read_text()) if self.index_file.exists() else {}
+        self.hits, self.misses, self.evicted = [], [], []
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file.write_text(json.dumps(self.index, indent=2))
+
+    def restore(self, key, scene):
+        """Put cached outputs for a section scene back into slides/, if any."""
+        entry = self.index.get(key)
+        if entry is None and (self.root / key / f"{scene}.json").exists():
+            # Stored by another process, eg. a cluster job, that does not own the index
+            entry = self.index[key] = {"scene": scene, "bytes": _tree_size(self.root / key), "last_used": 0}
+        if entry is None or not (self.root / key).is_dir():
+            self.misses.append(scene)
+            return False
+        _link_tree(self.root / key / "files", SLIDES_DIR / "files" / scene)
+        # manim-slides rewrites the JSON in place, so never hard-link it
+        shutil.copy2(self.root / key / f"{scene}.json", SLIDES_DIR / f"{scene}.json")
+        entry["last_used"] = time.time()
+        self.hits.append(scene)
+        return True
+
+    def store(self, key, scene):
+        """Record freshly rendered outputs of a section scene under its key."""
+        dest = self.root / key
+        # Filled aside and moved in place, so a reader never sees half an entry
+        tmp = self.root / f"{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        config = json.loads((SLIDES_DIR / f"{scene}.json").read_text())
+        used = {Path(s[k]).name for s in config["slides"] for k in ("file", "rev_file")}
+        (tmp / "files").mkdir(parents=True)
+        for name in used:
+            _link(SLIDES_DIR / "files" / scene / name, tmp / "files" / name)
+        shutil.copy2(SLIDES_DIR / f"{scene}.json", tmp / f"{scene}.json")
+        shutil.rmtree(dest, ignore_errors=True)
+        os.replace(tmp, dest)
+        self.index[key] = {"scene": scene, "bytes": _tree_size(dest), "last_used": time.time()}
+
+    def evict(self):
+        total = sum(e["bytes"] for e in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            del self.index[key]
+            total -= entry["bytes"]
+            self.evicted.append(entry["scene"])
+
+    def report(self):
+        print(f"Render cache: {len(self.hits)} hits, {len(self.misses)} misses, {len(self.evicted)} evicted")
+        for label, scenes in (("hit", self.hits), ("miss", self.misses), ("evicted", self.evicted)):
+            for scene in scenes:
+                print(f"  {label:<8} {scene}")
+
+
+def prune_assets(html, assets_dir):
+    """Delete files in a converted deck's assets folder, renditions included, that it no longer references."""
+    text = Path(html).read_text()
+    stale = [f for f in Path(assets_dir).rglob("[!.]*") if f.is_file() and f.name not in text]
+    for f in stale:
+        f.unlink()
+    return stale
+
+
+def _tree_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def _link(src, dst):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        if dst.samefile(src):
+            return
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _link_tree(src, dst):
+    for f in src.iterdir():
+        _link(f, dst / f.name)
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The deck's modules live at the top of the repository
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,133 @@
+import json
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+import bundle
+
+FPS, SECONDS = 25, 1
+COLORS = ("red", "green", "blue")
+HTML = """<html><body><div class="reveal"><div class="slides">{sections}</div></div>
+    <script src="reveal.js"></script>
+    <script>
+      Reveal.initialize({{}});
+    </script>
+</body></html>
+"""
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def box(kind, payload=b"", large=False):
+    if large:
+        return struct.pack(">I4sQ", 1, kind.encode(), 16 + len(payload)) + payload
+    return struct.pack(">I4s", 8 + len(payload), kind.encode()) + payload
+
+
+def test_boxes_and_find():
+    mdhd = box("mdhd", b"\0" * 24)
+    data = box("ftyp", b"isom") + box("moov", box("trak", box("mdia", mdhd)), large=True) + box("mdat", b"x" * 5)
+    assert [(k, s) for k, _, s, _ in bundle.boxes(data)] == [("ftyp", 12), ("moov", 16 + 16 + len(mdhd)), ("mdat", 13)]
+    start, end = bundle.find(data, "moov/trak/mdia/mdhd")
+    assert data[start:end] == b"\0" * 24
+    # A size of 0 runs to the end of the data
+    assert list(bundle.boxes(struct.pack(">I4s", 0, b"mdat") + b"xyz")) == [("mdat", 0, 11, 8)]
+    with pytest.raises(ValueError):
+        bundle.find(data, "moov/trak/minf")
+
+
+DECK = """
+class Deck(Slide):
+    SECTIONS = ("intro", "t10", "t11", "t12", "t13")
+
+    def intro(self):
+        self.title = cached_text("Containers", font_size=big_size)
+
+    def t10(self):
+        t10 = cached_text(f"1.0 Why", t2w={"1.0": BOLD}).to_edge(UP+LEFT)
+        cached_text("- a point")
+
+    def t11(self):
+        t11 = cached_text(f"1.1 {topic}").to_edge(UP+LEFT)
+        cached_text("- not the heading")
+
+    def t12(self):
+        self.play(FadeIn(Square()))
+"""
+
+
+def test_section_titles_fall_back_to_the_section_name(tmp_path):
+    (tmp_path / "deck.py").write_text(DECK)
+    slides = tmp_path / "slides"
+    slides.mkdir()
+    for name, count in [("intro", 1), ("t10", 2), ("t11", 1), ("t12", 1), ("t13", 1)]:
+        (slides / f"Deck_{name}.json").write_text(json.dumps({"slides": [{}] * count}))
+    assert bundle.section_titles(tmp_path / "deck.py", "Deck", slides) == [
+        ("intro", "Containers"), ("t10", "1.0 Why"), ("t10", "1.0 Why"),
+        # A heading that is not constant, no heading at all and a missing method
+        ("t11", "t11"), ("t12", "t12"), ("t13", "t13"),
+    ]
+
+
+@pytest.fixture
+def deck(tmp_path, monkeypatch):
+    """A converted deck of three one-second clips of different colors."""
+    assets = tmp_path / "Deck_assets"
+    assets.mkdir()
+    sections = []
+    for color in COLORS:
+        subprocess.run(["ffmpeg", "-v", "error", "-f", "lavfi", "-i", f"color=c={color}:s=320x180:d={SECONDS}:r={FPS}",
+                        "-c:v", "libx264", "-pix_fmt", "yuv420p", str(assets / f"{color}.mp4")], check=True)
+        sections.append(f'<section data-background-video="Deck_assets/{color}.mp4"></section>')
+    (tmp_path / "Deck.html").write_text(HTML.format(sections="".join(sections)))
+    if shutil.which("ffprobe") is None:
+        # The clips are made with a known timing, so it need not be probed
+        monkeypatch.setattr(bundle, "duration", lambda video: SECONDS)
+        monkeypatch.setattr(bundle, "frame_rate", lambda video: FPS)
+    return tmp_path / "Deck.html"
+
+
+@needs_ffmpeg
+def test_slide_ranges_start_at_moof_and_tile_the_bundle(deck):
+    titles = [("intro", "Intro"), ("t10", "1.0 Why"), ("t10", "1.0 Why")]
+    index = bundle.bundle(deck, titles)
+    assert json.loads((deck.parent / "Deck_assets" / "bundle.json").read_text()) == index
+    data = (deck.parent / index["bundle"]).read_bytes()
+    moofs = {offset for kind, offset, _, _ in bundle.boxes(data) if kind == "moof"}
+    frags, init_end = bundle.fragments(data)
+    assert {o for o, _ in frags} == moofs
+    assert index["init"] == [0, init_end]
+    assert index["mime"].startswith('video/mp4; codecs="avc1.')
+
+    ranges = [s["range"] for s in index["slides"]]
+    assert len(ranges) == len(COLORS)
+    assert all(start in moofs and start < end for start, end in ranges)
+    # Back to back from the end of the init segment to the end of the file
+    assert ranges[0][0] == init_end
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert ranges[-1][1] == len(data)
+    assert [(s["start"], s["end"]) for s in index["slides"]] == [(i * SECONDS, (i + 1) * SECONDS) for i in range(3)]
+    assert [s["title"] for s in index["slides"]] == [t for _, t in titles]
+
+    # What the player appends for a slide plays that slide's clip
+    for (start, end), color in zip(ranges, COLORS):
+        segment = deck.parent / f"{color}.mp4"
+        segment.write_bytes(data[:init_end] + data[start:end])
+        pixel = subprocess.run(["ffmpeg", "-v", "error", "-i", str(segment), "-frames:v", "1", "-vf", "scale=1:1",
+                                "-f", "rawvideo", "-pix_fmt", "rgb24", "-"], check=True, stdout=subprocess.PIPE).stdout
+        assert max(range(3), key=lambda c: pixel[c]) == COLORS.index(color)
+
+    html = deck.read_text()
+    assert bundle.BUNDLE_MARKER in html and "data-background-video" not in html
+    assert html.index(bundle.BUNDLE_MARKER) < html.index("Reveal.initialize(")
+
+
+@needs_ffmpeg
+def test_codec_mime_matches_the_encoded_profile(deck):
+    index = bundle.bundle(deck)
+    data = (deck.parent / index["bundle"]).read_bytes()
+    # High profile is what libx264 picks for yuv420p by default
+    assert index["mime"] == bundle.codec_mime(data)
+    assert index["mime"][:len('video/mp4; codecs="avc1.64')] == 'video/mp4; codecs="avc1.64'
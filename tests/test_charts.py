@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("manim")
+import charts  # noqa: E402
+from conftest import ROOT  # noqa: E402
+
+SCALING = ROOT / "data" / "scaling.csv"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(charts, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def no_parquet(monkeypatch):
+    def to_parquet(*args, **kwargs):
+        raise ImportError("Unable to find a usable engine")
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", to_parquet)
+
+
+def assert_same(a, b):
+    assert list(a) == list(b)
+    for label in a:
+        np.testing.assert_array_equal(a[label][0], b[label][0])
+        np.testing.assert_array_equal(a[label][1], b[label][1])
+
+
+def test_npz_cache_round_trip(cache, no_parquet):
+    first = charts.load_series(SCALING, x="cores", y="runtime", by="build")
+    assert [f.suffix for f in cache.iterdir()] == [".npz"]
+    assert list(first) == ["native", "container"]
+    # The second load is served from the npz entry, string labels included
+    second = charts.load_series(SCALING, x="cores", y="runtime", by="build")
+    assert_same(first, second)
+
+
+def test_unreadable_entry_is_a_miss(cache, no_parquet):
+    first = charts.load_series(SCALING, x="cores", y="runtime", by="build")
+    npz = next(cache.iterdir())
+    # A parquet entry written after parquet support was installed, unreadable now
+    npz.with_suffix(".parquet").write_bytes(b"not parquet")
+    assert_same(charts.load_series(SCALING, x="cores", y="runtime", by="build"), first)
+    npz.with_suffix(".parquet").unlink()
+    npz.write_bytes(b"not npz either")
+    assert_same(charts.load_series(SCALING, x="cores", y="runtime", by="build"), first)
@@ -0,0 +1,107 @@
+import re
+import shutil
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import devserver
+from conftest import ROOT
+from postprocess import PRELOAD_MARKER, PRELOAD_SCRIPT, lazy_preload
+
+VIDEO_RE = re.compile(r'data-(?:background|deck)-video="([^"]+)"')
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """The converted deck, lazily preloaded as produce.sh leaves it, served on a free port."""
+    shutil.copy(ROOT / "index.html", tmp_path / "index.html")
+    (tmp_path / "Apptainer_assets").symlink_to(ROOT / "Apptainer_assets")
+    lazy_preload(tmp_path / "index.html")
+    server = devserver.make_server(0, str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}", tmp_path, server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("ahead", [2, 4])
+def test_lazy_preload_rewrites_the_deck(tmp_path, ahead):
+    html = tmp_path / "index.html"
+    shutil.copy(ROOT / "index.html", html)
+    videos = re.findall(r'data-background-video="([^"]+)"', html.read_text())
+    assert videos
+    lazy_preload(html, ahead)
+    text = html.read_text()
+    script = PRELOAD_SCRIPT % {"ahead": ahead}
+    assert text.count(PRELOAD_MARKER) == 1 and text.count(script) == 1
+    # Every video waits under data-deck-video until the script arms it, only the -muted flags keep their name
+    markup = text.replace(script, "")
+    assert not re.search(r"data-background-video(?!-muted)", markup)
+    assert re.findall(r'data-deck-video="([^"]+)"', markup) == videos
+    assert re.findall(r"\bviewDistance: (\d+)", text) == [str(ahead + 1)]
+    assert re.findall(r"mobileViewDistance: (\d+)", text) == [str(ahead + 1)]
+    init = text.index("Reveal.initialize(")
+    assert text.index(script) < text.rindex("<script", 0, init) < init
+
+    lazy_preload(html, ahead)
+    assert html.read_text() == text
+
+
+def get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_html_and_every_slide_video_load(deck):
+    url, root, _ = deck
+    status, _, body = get(f"{url}/index.html")
+    assert status == 200
+    html = body.decode()
+    assert "Reveal.initialize(" in html and "deck: lazy preload" in html
+    videos = list(dict.fromkeys(VIDEO_RE.findall(html)))
+    assert videos
+    for video in videos:
+        status, headers, body = get(f"{url}/{video}")
+        assert status == 200, video
+        assert headers["Content-Type"] == "video/mp4"
+        assert body == (root / video).read_bytes()
+
+
+def test_range_requests(deck):
+    url, root, _ = deck
+    video = VIDEO_RE.search((root / "index.html").read_text()).group(1)
+    data = (root / video).read_bytes()
+    size = len(data)
+
+    status, headers, body = get(f"{url}/{video}", Range="bytes=100-1099")
+    assert status == 206
+    assert headers["Content-Range"] == f"bytes 100-1099/{size}"
+    assert int(headers["Content-Length"]) == 1000
+    assert body == data[100:1100]
+
+    # Open-ended and overlong ranges stop at the last byte
+    for requested in (f"bytes={size - 10}-", f"bytes={size - 10}-{size + 50}"):
+        status, headers, body = get(f"{url}/{video}", Range=requested)
+        assert status == 206
+        assert headers["Content-Range"] == f"bytes {size - 10}-{size - 1}/{size}"
+        assert body == data[-10:]
+
+    status, headers, _ = get(f"{url}/{video}", Range=f"bytes={size}-")
+    assert status == 416
+    assert headers["Content-Range"] == f"bytes */{size}"
+
+
+def test_requests_are_traced_per_slide(deck):
+    url, root, server = deck
+    video = VIDEO_RE.search((root / "index.html").read_text()).group(1)
+    get(f"{url}/index.html")
+    assert get(f"{url}/__slide/3")[0] == 204
+    get(f"{url}/{video}", Range="bytes=0-9")
+    assert server.requests[0] == ["index.html"]
+    assert server.requests[3] == [f"{video} [bytes=0-9]"]
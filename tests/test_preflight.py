@@ -0,0 +1,32 @@
+import shutil
+
+import pytest
+
+import preflight
+
+DECK = """from manim import *
+from plots import chart
+
+Tex.set_default(font_size=24)
+
+
+class Deck(Slide):
+    def intro(self):
+        self.add(Text("Hello"))
+"""
+
+
+@pytest.fixture
+def deck(tmp_path):
+    (tmp_path / "plots.py").write_text("from manim import Axes\n\n\ndef chart():\n    return Axes(x_range=[0, 1])\n")
+    (tmp_path / "deck.py").write_text(DECK)
+    return tmp_path / "deck.py"
+
+
+def test_latex_is_checked_where_the_deck_typesets_with_it(deck, monkeypatch):
+    monkeypatch.setattr(preflight, "installed_fonts", lambda: set())
+    monkeypatch.setattr(shutil, "which", lambda tool: None if tool == "dvisvgm" else f"/usr/bin/{tool}")
+    # Axes in the imported module, not the Tex default in the deck
+    assert preflight.check(deck) == [f"{deck.parent / 'plots.py'}:5: Axes typesets with LaTeX, but dvisvgm is not installed"]
+    monkeypatch.setattr(shutil, "which", lambda tool: f"/usr/bin/{tool}")
+    assert preflight.check(deck) == []
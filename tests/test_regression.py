@@ -0,0 +1,49 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from PIL import Image, ImageDraw
+
+import regression
+from conftest import ROOT
+
+
+def slide(path, x=40, color="navy"):
+    im = Image.new("RGB", (320, 180), "white")
+    ImageDraw.Draw(im).rectangle((x, 40, x + 120, 140), fill=color)
+    im.save(path)
+    return path
+
+
+def test_update_then_compare(tmp_path):
+    current = {"Deck_intro_0000.png": slide(tmp_path / "a.png"), "Deck_intro_0001.png": slide(tmp_path / "b.png", 180)}
+    root = tmp_path / "reference"
+    regression.update(current, ("Deck_intro_",), root)
+    stored = json.loads((root / regression.MANIFEST).read_text())
+    assert sorted(stored) == sorted(current)
+    references = regression.references(("Deck_intro_",), root)
+    assert regression.compare(current, references) == []
+    # Moved content is caught, a lost and a new slide are reported without a distance
+    moved = {"Deck_intro_0000.png": slide(tmp_path / "c.png", 180), "Deck_intro_0002.png": current["Deck_intro_0001.png"]}
+    differing = dict(regression.compare(moved, references))
+    assert differing.keys() == {"Deck_intro_0000.png", "Deck_intro_0001.png", "Deck_intro_0002.png"}
+    assert differing["Deck_intro_0000.png"] > 6
+    assert differing["Deck_intro_0001.png"] is None and differing["Deck_intro_0002.png"] is None
+
+
+def test_update_keeps_other_sections(tmp_path):
+    root = tmp_path / "reference"
+    regression.update({"Deck_intro_0000.png": slide(tmp_path / "a.png")}, ("Deck_intro_",), root)
+    regression.update({"Deck_t11_0000.png": slide(tmp_path / "b.png")}, ("Deck_t11_",), root)
+    assert sorted(regression.references(("Deck_",), root)) == ["Deck_intro_0000.png", "Deck_t11_0000.png"]
+    assert regression.references(("Deck_",), tmp_path / "missing") == {}
+
+
+@pytest.mark.skipif(not (ROOT / regression.REFERENCE_DIR / regression.MANIFEST).exists(),
+                    reason="no reference hashes, store them with: python build.py regress --update")
+def test_deck_matches_references():
+    pytest.importorskip("manim")
+    run = subprocess.run([sys.executable, "build.py", "regress", "--no-preflight"],
+                         cwd=ROOT, capture_output=True, text=True)
+    assert run.returncode == 0, run.stdout + run.stderr
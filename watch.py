@@ -0,0 +1,191 @@
+"""Re-rendering a deck while it is edited, with live reload in the browser.
+
+``watch`` polls the deck source, the modules next to it that it imports
+(the same ones its render cache keys hash), ``images/`` and ``data/`` and,
+once a change has settled, calls back into the build to re-render. Only
+sections whose render cache key changed are rendered again (see
+render_cache.py), the rest are restored, and the deck HTML is stitched in
+place. A small script injected into the HTML keeps a websocket open to
+``/__reload`` on the local server; after a rebuild the server sends the
+index of the first edited slide and the page reloads onto that slide.
+
+Within a section, the edited slide is found by counting ``next_slide()``
+calls in the method source before the first changed line. Slides made in
+loops are counted once, so the landing slide is a close guess there.
+"""
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SLIDES_DIR = Path("slides")
+RELOAD_MARKER = "<!-- deck: live reload -->"
+RELOAD_SCRIPT = """<script>
+      (function () {
+        var KEY = "deck-reload-slide";
+        function land() {
+          var slide = sessionStorage.getItem(KEY);
+          if (slide !== null) {
+            sessionStorage.removeItem(KEY);
+            Reveal.slide(+slide);
+          }
+        }
+        Reveal.isReady() ? land() : Reveal.on("ready", land);
+        var socket = new WebSocket("ws://" + location.host + "/__reload");
+        socket.onmessage = function (e) {
+          var slide = JSON.parse(e.data).slide;
+          sessionStorage.setItem(KEY, slide === null ? Reveal.getIndices().h : slide);
+          location.reload();
+        };
+      })();
+    </script>"""
+# RFC 6455: the handshake answer hashes the client's key with this GUID
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class ReloadHandler(SimpleHTTPRequestHandler):
+    # Browsers only accept the websocket upgrade over HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path != "/__reload" or self.headers.get("Upgrade", "").lower() != "websocket":
+            super().do_GET()
+            return
+        key = self.headers["Sec-WebSocket-Key"]
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        with self.server.lock:
+            self.server.clients.add(self.wfile)
+        # The page never sends anything but a close frame; wait for it or EOF
+        try:
+            while self.rfile.read(1):
+                pass
+        except OSError:
+            pass
+        with self.server.lock:
+            self.server.clients.discard(self.wfile)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def broadcast(server, message):
+    """Send a JSON text frame to every connected page."""
+    data = json.dumps(message).encode()
+    if len(data) < 126:
+        header = struct.pack(">BB", 0x81, len(data))
+    else:
+        header = struct.pack(">BBH", 0x81, 126, len(data))
+    with server.lock:
+        for client in list(server.clients):
+            try:
+                client.write(header + data)
+                client.flush()
+            except OSError:
+                server.clients.discard(client)
+        return len(server.clients)
+
+
+def inject_reload(html):
+    """Add the reload script to a stitched deck, unless it has it already."""
+    html = Path(html)
+    if not html.exists():
+        return
+    text = html.read_text()
+    if RELOAD_MARKER in text:
+        return
+    end = text.rindex("</body>")
+    html.write_text(f"{text[:end]}{RELOAD_MARKER}\n    {RELOAD_SCRIPT}\n  {text[end:]}")
+
+
+def snapshot(paths):
+    """Modification time and size of every file under the given paths."""
+    files = {}
+    for path in map(Path, paths):
+        for file in ([path] if path.is_file() else sorted(path.rglob("*")) if path.is_dir() else []):
+            if file.is_file():
+                stat = file.stat()
+                files[str(file)] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def _slide_offset(before, after, name):
+    """Slides of a section before the first line that changed in its method."""
+    if name not in before.methods or name not in after.methods:
+        return 0
+    old = before.source(before.methods[name]).splitlines()
+    new = after.source(after.methods[name]).splitlines()
+    first = next((i for i, (a, b) in enumerate(zip(old, new)) if a != b), min(len(old), len(new)))
+    return sum(line.count("next_slide(") for line in new[:first])
+
+
+def first_edited_slide(before, after, changed, scene, slides_dir=SLIDES_DIR):
+    """Index in the stitched deck of the first slide of the changed sections that was edited."""
+    slide = 0
+    for name in after.sections:
+        config = Path(slides_dir) / f"{scene}_{name}.json"
+        count = len(json.loads(config.read_text())["slides"]) if config.exists() else 0
+        if name in changed:
+            return slide + min(_slide_offset(before, after, name), max(count - 1, 0))
+        slide += count
+    return None
+
+
+def watch(paths, rebuild, html, port=8000, interval=0.5):
+    """Call ``rebuild()`` whenever files under ``paths`` change, then reload open pages.
+
+    ``paths`` may be a callable, asked again on every poll so newly imported
+    modules are watched too. ``rebuild`` returns the slide to land on, or None
+    when nothing needed rendering.
+    """
+    watched = paths if callable(paths) else lambda: paths
+    server = ThreadingHTTPServer(("localhost", port), partial(ReloadHandler, directory="."))
+    server.clients, server.lock = set(), threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    inject_reload(html)
+    print(f"Watching {', '.join(map(str, watched()))}, open http://localhost:{port}/{html}")
+    seen = snapshot(watched())
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(watched())
+            if current == seen:
+                continue
+            # Editors and copies write in several steps, wait for the files to settle
+            while True:
+                time.sleep(interval)
+                settled = snapshot(watched())
+                if settled == current:
+                    break
+                current = settled
+            changed = sorted(p for p in current.keys() | seen.keys() if current.get(p) != seen.get(p))
+            seen = current
+            print(f"\nChanged: {', '.join(changed)}")
+            start = time.perf_counter()
+            try:
+                slide = rebuild()
+            except (SystemExit, SyntaxError) as e:
+                print(f"Rebuild failed, keeping the last deck: {e}")
+                continue
+            if slide is None:
+                print("No section changed, nothing to render")
+                continue
+            inject_reload(html)
+            pages = broadcast(server, {"slide": slide})
+            print(f"Rebuilt in {time.perf_counter() - start:.1f}s, reloaded {pages} pages on slide {slide}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
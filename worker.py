@@ -0,0 +1,144 @@
+"""A long-lived render process that keeps manim imported between jobs.
+
+A cold ``manim`` run spends seconds before its first frame: importing
+manim, NumPy, Cairo/Pango bindings, manim-slides and pandas, and loading
+the fontconfig cache on the first text layout. ``serve`` pays that once,
+then listens on a Unix socket. Every job (the argv of a ``manim`` command
+line, its environment and working directory) runs in a child forked from
+the warm process, so jobs start in milliseconds, run in parallel and
+cannot leak manim's global config into each other.
+
+Installed packages stay imported; modules of the project (deck.py,
+the deck file, the caches) are dropped in the child and imported afresh,
+because they read ``DECK_*`` variables at import time and may have been
+edited since. The child answers with the exit code, the captured output,
+and how long the job took to start, which the server also logs per job
+next to the cold start it saved.
+"""
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import sysconfig
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+SOCKET_PATH = Path(".render-worker.sock")
+
+
+def installed_modules():
+    """Names of the imported modules that come from the standard library or site-packages."""
+    roots = tuple({os.path.realpath(sysconfig.get_paths()[k]) + os.sep
+                   for k in ("stdlib", "platstdlib", "purelib", "platlib")})
+    return {name for name, module in sys.modules.items()
+            if getattr(module, "__file__", None) is None or os.path.realpath(module.__file__).startswith(roots)}
+
+
+def _job(conn, received, cold, number, console, keep):
+    """Run one job in the forked child and answer it; returns the exit code."""
+    request = json.loads(conn.makefile("rb").readline())
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    for name in [n for n in sys.modules if n not in keep and n != "__main__"]:
+        del sys.modules[name]
+
+    from manim import config
+    from manim.__main__ import main as manim_cli
+    from manim._config.utils import make_config_parser
+    # The server imported manim elsewhere, pick up a manim.cfg in the job's directory
+    config.digest_parser(make_config_parser())
+
+    log = tempfile.TemporaryFile()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    startup = time.perf_counter() - received
+    start = time.perf_counter()
+    try:
+        manim_cli(args=request["argv"][1:], prog_name="manim", standalone_mode=False)
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        code = getattr(e, "exit_code", 1)
+        traceback.print_exc()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    log.seek(0)
+    output = io.TextIOWrapper(log, errors="replace").read()
+    conn.sendall(json.dumps({"code": code, "output": output, "startup": startup, "cold": cold}).encode())
+    conn.close()
+    scene = request["argv"][-1]
+    os.write(console, f"  job {number:<4} {scene:<24} exit {code:<3} startup {startup:6.3f}s "
+                      f"(cold {cold:.1f}s)  render {time.perf_counter() - start:7.1f}s\n".encode())
+    return code
+
+
+def serve(path=SOCKET_PATH):
+    start = time.perf_counter()
+    import manim
+    import manim_slides  # noqa: F401
+    import numpy  # noqa: F401
+    from PIL import Image  # noqa: F401
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        pass
+    # Fontconfig reads its cache and Pango sets up on the first layout
+    manim.Text("warm")
+    cold = time.perf_counter() - start
+    keep = installed_modules()
+
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen()
+    # Children are never waited for, let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    console = os.dup(1)
+    print(f"Render worker ready on {path} after a {cold:.1f}s cold start, Ctrl-C to stop", flush=True)
+    number = 0
+    try:
+        while True:
+            conn, _ = listener.accept()
+            received = time.perf_counter()
+            number += 1
+            if os.fork() == 0:
+                listener.close()
+                # manim runs ffmpeg and others as subprocesses it waits for
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                code = 1
+                try:
+                    code = _job(conn, received, cold, number, console, keep)
+                finally:
+                    os._exit(code)
+            conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        path.unlink(missing_ok=True)
+
+
+def run(path, argv, env, cwd=None):
+    """Render a ``manim`` command line on the worker: (exit code, output, startup seconds, cold start seconds)."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            raise SystemExit(f"No render worker on {path}, start one with: python build.py worker")
+        request = {"argv": list(argv), "env": dict(env), "cwd": str(Path(cwd or ".").resolve())}
+        s.sendall(json.dumps(request).encode() + b"\n")
+        reply = s.makefile("rb").read()
+    if not reply:
+        return 1, "Render worker job died without answering", 0.0, 0.0
+    result = json.loads(reply)
+    return result["code"], result["output"], result["startup"], result["cold"]